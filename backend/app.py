@@ -10,15 +10,21 @@ project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from trainer import train_model
 from processor import merge_macro_and_events
-from predictor import StockPredictor
-from config import DATA_DIR, MODEL_PATH
+from model_manager import ModelManager
+from metrics import MetricsRegistry, instrument_app
+from config import DATA_DIR, MODEL_PATH, PROFILING_ENABLED, PROFILE_DIR
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-predictor = StockPredictor()
+models = ModelManager()
+metrics = instrument_app(app, MetricsRegistry(), PROFILE_DIR if PROFILING_ENABLED else None)
+
+@app.before_request
+def sync_model():
+    # Pick up models retrained by another worker process
+    models.reload_if_changed()
 
 @app.route('/')
 def home():
@@ -26,18 +32,27 @@ def home():
         'message': 'Stock Prediction API',
         'endpoints': {
             'predict': '/predict/<ticker>',
+            'predict_batch': '/predict_batch?tickers=TCS,VBL',
             'train': '/train',
-            'update_macro': '/update_macro'
+            'train_status': '/train/<job_id>',
+            'update_macro': '/update_macro',
+            'metrics': '/metrics'
         }
     })
 
 @app.route('/train', methods=['POST'])
 def retrain():
-    train_model()
-    # Reload predictor with new model
-    global predictor
-    predictor = StockPredictor()
-    return jsonify({'status': 'model retrained'}), 200
+    # Training runs in a worker process; the new model is swapped in when done
+    job_id = models.start_training()
+    return jsonify(models.get_job(job_id)), 202
+
+@app.route('/train/<job_id>', methods=['GET'])
+def train_status(job_id):
+    job = models.get_job(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown training job {job_id}'}), 404
+    version, _ = models.current()
+    return jsonify(dict(job, active_model_version=version)), 200
 
 @app.route('/update_macro', methods=['POST'])
 def update_macro():
@@ -48,52 +63,72 @@ def update_macro():
 @app.route('/predict/<ticker>', methods=['GET'])
 def predict(ticker):
     try:
-        pred, conf = predictor.predict(ticker)
-        return jsonify({
-            'ticker': ticker,
-            'prediction': pred,
-            'confidence': round(conf, 4),
-            'direction': 'UP' if pred == 1 else 'DOWN'
-        }), 200
+        pred, conf, timings = models.predictor.predict_timed(ticker)
+        metrics.observe_phase('feature_lookup', timings['feature_lookup_ms'] / 1000)
+        metrics.observe_phase('inference', timings['inference_ms'] / 1000)
+        with metrics.phase('serialization'):
+            response = jsonify({
+                'ticker': ticker,
+                'prediction': pred,
+                'confidence': round(conf, 4),
+                'direction': 'UP' if pred == 1 else 'DOWN',
+                'timings_ms': {k: round(v, 3) for k, v in timings.items()}
+            })
+        return response, 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/predict_batch', methods=['GET'])
+def predict_batch():
+    try:
+        tickers = request.args.get('tickers')
+        if tickers:
+            tickers = [t.strip() for t in tickers.split(',') if t.strip()]
+        with metrics.phase('inference'):
+            results = models.predictor.predict_many(tickers or None)
+        with metrics.phase('serialization'):
+            response = jsonify({
+                'predictions': [{
+                    'ticker': ticker,
+                    'prediction': pred,
+                    'confidence': round(conf, 4),
+                    'direction': 'UP' if pred == 1 else 'DOWN'
+                } for ticker, pred, conf in results]
+            })
+        return response, 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def cached_json(route, ticker=None):
+    """Serve a body precomputed when the active model was loaded, if there is one"""
+    body = models.cached_response(route, ticker)
+    if body is None:
+        return None
+    return app.response_class(body, status=200, mimetype='application/json')
+
 @app.route('/feature_importances', methods=['GET'])
 @app.route('/feature_importances/<ticker>', methods=['GET'])
 def get_feature_importances(ticker=None):
+    cached = cached_json('feature_importances', ticker)
+    if cached is not None:
+        return cached
     try:
-        importances = predictor.model.feature_importances_.tolist()
-        feature_names = predictor.features
-        
-        if ticker:
-            # Get feature values for the specific ticker
-            X = predictor.get_latest_features(ticker)
-            feature_values = X[0].tolist()
-            
-            # Scale importances based on feature values
-            scaled_importances = [imp * abs(val) for imp, val in zip(importances, feature_values)]
-            total = sum(scaled_importances)
-            if total > 0:  # Normalize
-                scaled_importances = [imp/total for imp in scaled_importances]
-            importances = scaled_importances
-            
-        return jsonify({
-            'features': feature_names,
-            'importances': importances
-        }), 200
+        return jsonify(models.predictor.get_feature_importances(ticker)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @app.route('/price_history/<ticker>', methods=['GET'])
 def get_price_history(ticker):
+    cached = cached_json('price_history', ticker)
+    if cached is not None:
+        return cached
     try:
         # Get last 30 days of price data
-        df = predictor.data[predictor.data['ticker'] == ticker].sort_values('date')
-        df = df.tail(30)
+        dates, prices = models.predictor.get_price_history(ticker, days=30)
         
         return jsonify({
-            'dates': df['date'].dt.strftime('%Y-%m-%d').tolist(),
-            'prices': df['close_price'].tolist()
+            'dates': dates,
+            'prices': prices
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
@@ -0,0 +1,125 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class FetchResult:
+    """Status, headers and raw body of one HTTP response"""
+
+    def __init__(self, url, status, headers, body, encoding=None):
+        self.url = url
+        self.status = status
+        # Case-insensitive, as servers differ on ETag vs Etag
+        self.headers = CIMultiDict(headers)
+        self.body = body
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self):
+        return self.body.decode(self.encoding, errors='replace')
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AsyncFetcher:
+    """Concurrent HTTP client for the scrapers.
+
+    One keep-alive connection pool is shared by every request; each host gets
+    its own concurrency cap and token bucket, and throttled or failed requests
+    are retried with exponential backoff. Use as an async context manager:
+
+        async with AsyncFetcher() as fetcher:
+            results = await fetcher.fetch_all(urls)
+    """
+
+    def __init__(self, requests_per_second=1.0, burst=2, per_host=2, max_connections=16,
+                 retries=3, backoff=1.0, timeout=30, headers=None):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self.buckets = {}
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.close()
+        return False
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        return self.buckets[host]
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def fetch(self, url, headers=None):
+        """GET url, retrying connection errors, timeouts and RETRY_STATUSES.
+
+        Once retries run out the last response is returned (or the last
+        connection error raised) so callers decide how to handle it.
+        """
+        for attempt in range(self.retries + 1):
+            await self._bucket(url).acquire()
+            try:
+                async with self.session.get(url, headers=headers) as resp:
+                    body = await resp.read()
+                    result = FetchResult(url, resp.status, resp.headers, body, resp.charset)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self._delay(attempt))
+                continue
+
+            if result.status in RETRY_STATUSES and attempt < self.retries:
+                await asyncio.sleep(self._delay(attempt, result.headers.get('Retry-After')))
+                continue
+            return result
+
+    async def fetch_all(self, urls):
+        """Fetch urls concurrently; results come back in input order, exceptions in place of failures"""
+        return await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
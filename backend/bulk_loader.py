@@ -0,0 +1,147 @@
+import sqlite3
+import pandas as pd
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Keys per `IN (...)` lookup; SQLite caps bound parameters per statement, stay well under it
+LOOKUP_CHUNK = 500
+
+def to_db_rows(df, columns):
+    """Convert df[columns] to DB-API parameter tuples in one vectorized pass.
+
+    Datetime columns become datetime.date, NaN/NaT become None, and numpy
+    scalars become plain Python numbers that every connector accepts.
+    """
+    frame = df[columns].copy()
+    for col in columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.date
+    frame = frame.astype(object).where(frame.notna(), None)
+    return list(frame.itertuples(index=False, name=None))
+
+def iter_db_rows(df, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield parameter tuples chunk by chunk so large frames never become one giant list"""
+    for start in range(0, len(df), batch_size):
+        yield to_db_rows(df.iloc[start:start + batch_size], columns)
+
+def build_upsert_sql(conn, table, columns, key_columns, update_columns=None):
+    """INSERT ... upsert statement for MySQL, or for sqlite3 when testing locally"""
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in key_columns]
+    col_list = ', '.join(columns)
+
+    if isinstance(conn, sqlite3.Connection):
+        placeholders = ', '.join(['?'] * len(columns))
+        updates = ', '.join(f"{c}=excluded.{c}" for c in update_columns)
+        return (f"INSERT INTO {table} ({col_list}) VALUES ({placeholders}) "
+                f"ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET {updates}")
+
+    placeholders = ', '.join(['%s'] * len(columns))
+    updates = ', '.join(f"{c}=VALUES({c})" for c in update_columns)
+    return f"INSERT INTO {table} ({col_list}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {updates}"
+
+def ensure_columns(conn, table, columns):
+    """Add any of columns ({name: SQL type}) missing from an existing table; returns the names added.
+
+    CREATE TABLE IF NOT EXISTS leaves older tables untouched, so columns added
+    to a schema later are migrated in with ALTER TABLE.
+    """
+    cur = conn.cursor()
+    try:
+        if isinstance(conn, sqlite3.Connection):
+            cur.execute(f"PRAGMA table_info({table})")
+            existing = {row[1] for row in cur.fetchall()}
+        else:
+            cur.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,)
+            )
+            existing = {row[0] for row in cur.fetchall()}
+
+        added = [name for name in columns if name not in existing]
+        for name in added:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {columns[name]}")
+        conn.commit()
+        return added
+    finally:
+        cur.close()
+
+def bulk_upsert(conn, table, df, columns, key_columns=('date',), update_columns=None,
+                batch_size=DEFAULT_BATCH_SIZE):
+    """Upsert df into table with chunked executemany, committing once per chunk.
+
+    mysql-connector rewrites executemany INSERTs into multi-row statements,
+    so each chunk is a single round trip. Returns the number of rows sent.
+    """
+    sql = build_upsert_sql(conn, table, columns, list(key_columns), update_columns)
+    cur = conn.cursor()
+    sent = 0
+    try:
+        for rows in iter_db_rows(df, columns, batch_size):
+            cur.executemany(sql, rows)
+            conn.commit()
+            sent += len(rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return sent
+
+class BufferedWriter:
+    """Collects parameter rows and writes them with executemany, one commit per chunk.
+
+    Use as a context manager (or call close()) so the final partial chunk is
+    flushed; the with block flushes it even when it exits with an exception.
+    """
+
+    def __init__(self, conn, sql, batch_size=DEFAULT_BATCH_SIZE):
+        self.conn = conn
+        self.sql = sql
+        self.batch_size = batch_size
+        self.cursor = conn.cursor()
+        self.pending = []
+        self.written = 0
+
+    def add(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, rows):
+        for row in rows:
+            self.add(row)
+
+    def add_frame(self, df, columns):
+        """Queue df[columns] using the vectorized NaN/date/numpy conversion"""
+        for rows in iter_db_rows(df, columns, self.batch_size):
+            self.add_many(rows)
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.cursor.executemany(self.sql, self.pending)
+        self.conn.commit()
+        self.written += len(self.pending)
+        self.pending = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return False
+        # Rows queued before the error are complete; write them like the chunks already committed
+        try:
+            self.close()
+        except Exception:
+            # Let the original error propagate rather than the failed flush
+            self.conn.rollback()
+        return False
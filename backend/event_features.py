@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+IMPACT_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+
+def _to_days(values):
+    """datetime-like values -> int64 day numbers, so searchsorted compares plain integers"""
+    return pd.to_datetime(pd.Series(values)).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+def encode_event_flags(dates, events):
+    """Return one <event_type>_flag column per event type.
+
+    A date is flagged when it falls inside any [impact_window_start,
+    impact_window_end] window of that type. With the window starts and ends
+    sorted separately, the number of windows covering a date is
+    (#starts <= date) - (#ends < date), so every date is resolved with two
+    searchsorted calls instead of one full-frame mask per event row.
+    """
+    days = _to_days(dates)
+    flags = {}
+    for evt, windows in events.groupby('event_type', sort=False):
+        starts = np.sort(_to_days(windows['impact_window_start']))
+        ends = np.sort(_to_days(windows['impact_window_end']))
+        covering = np.searchsorted(starts, days, side='right') - np.searchsorted(ends, days, side='left')
+        flags[f"{evt.lower()}_flag"] = (covering > 0).astype(int)
+    return pd.DataFrame(flags, index=getattr(dates, 'index', None))
+
+def create_event_features(dates, events_df, window_days=7):
+    """
+    Event timing features for each date (same definitions as the modeling notebook):
+    - days_to_next_event: days until the next event (365 if none)
+    - days_since_last_event: days since the last event on or before the date (365 if none)
+    - is_event_window: 1 if within ±window_days of any event
+    - event_impact_score: impact weight (high=3, medium=2, low=1) of the
+      earliest event whose window covers the date
+    - upcoming_event_type / recent_event_type
+    """
+    events_df = events_df.sort_values('date', kind='mergesort').reset_index(drop=True)
+    event_days = _to_days(events_df['date'])
+    event_types = events_df['event_type'].to_numpy(dtype=object)
+    weights = events_df['impact_level'].map(IMPACT_WEIGHTS).fillna(0).to_numpy(dtype=np.int64)
+    n = len(event_days)
+
+    days = _to_days(dates)
+    out = pd.DataFrame({'date': pd.to_datetime(pd.Series(dates)).to_numpy()})
+    if n == 0:
+        return out.assign(days_to_next_event=365.0, upcoming_event_type='none',
+                          days_since_last_event=365.0, recent_event_type='none',
+                          is_event_window=0, event_impact_score=0)
+
+    # Next event is strictly after the date, last event is on or before it
+    next_idx = np.searchsorted(event_days, days, side='right')
+    has_next = next_idx < n
+    safe_next = np.minimum(next_idx, n - 1)
+    out['days_to_next_event'] = np.where(has_next, event_days[safe_next] - days, 365).astype(float)
+    out['upcoming_event_type'] = np.where(has_next, event_types[safe_next], 'none')
+
+    last_idx = next_idx - 1
+    has_last = last_idx >= 0
+    safe_last = np.maximum(last_idx, 0)
+    out['days_since_last_event'] = np.where(has_last, days - event_days[safe_last], 365).astype(float)
+    out['recent_event_type'] = np.where(has_last, event_types[safe_last], 'none')
+
+    # Earliest event on or after date - window; the date is in its window if it is also <= date + window
+    first_idx = np.searchsorted(event_days, days - window_days, side='left')
+    safe_first = np.minimum(first_idx, n - 1)
+    in_window = (first_idx < n) & (event_days[safe_first] <= days + window_days)
+    out['is_event_window'] = in_window.astype(int)
+    out['event_impact_score'] = np.where(in_window, weights[safe_first], 0)
+
+    return out
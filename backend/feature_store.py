@@ -0,0 +1,231 @@
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import DATA_DIR, FEATURE_STORE_DIR
+
+MANIFEST = 'manifest.json'
+
+# upsert_table rewrites the table into one partition once either is exceeded
+COMPACT_MAX_PARTITIONS = 8
+COMPACT_MAX_DROPPED_FRACTION = 0.25
+
+# Each table is a directory holding a manifest plus one or more partitions;
+# every partition stores each column as its own .npy file so readers can
+# memory-map just the columns they need.
+#
+#   feature_store/features_with_events/
+#       manifest.json
+#       part-00000/date.npy, ticker.npy, close_price.npy, ...
+
+def _table_dir(name, store_dir=None):
+    return os.path.join(store_dir or FEATURE_STORE_DIR, name)
+
+def read_manifest(name, store_dir=None):
+    path = os.path.join(_table_dir(name, store_dir), MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def _write_manifest(table_dir, manifest):
+    # Replace atomically so readers see either the old or the new table
+    tmp_path = os.path.join(table_dir, MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(table_dir, MANIFEST))
+
+def _column_schema(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return {'kind': 'datetime', 'dtype': 'datetime64[ns]'}
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return {'kind': 'numeric', 'dtype': str(series.dtype)}
+    return {'kind': 'category', 'dtype': 'int32', 'categories': []}
+
+def _write_partition(table_dir, part_name, df, columns):
+    part_dir = os.path.join(table_dir, part_name)
+    os.makedirs(part_dir, exist_ok=True)
+    for col, schema in columns.items():
+        if schema['kind'] == 'datetime':
+            values = df[col].to_numpy(dtype='datetime64[ns]')
+        elif schema['kind'] == 'category':
+            # New labels are appended so codes already on disk stay valid
+            categories = schema['categories']
+            labels = df[col].astype(str)
+            for label in pd.unique(labels):
+                if label not in categories:
+                    categories.append(label)
+            values = pd.Categorical(labels, categories=categories).codes.astype(np.int32)
+        else:
+            values = df[col].to_numpy(dtype=schema['dtype'])
+        np.save(os.path.join(part_dir, f'{col}.npy'), np.ascontiguousarray(values))
+
+    part = {'name': part_name, 'rows': len(df)}
+    # Date bounds let upserts skip partitions that cannot hold a matching key
+    if 'date' in columns and len(df):
+        part['min_date'] = str(df['date'].min().date())
+        part['max_date'] = str(df['date'].max().date())
+    return part
+
+def write_table(df, name, store_dir=None, metadata=None):
+    """Write df as a fresh single-partition table, replacing any previous version"""
+    table_dir = _table_dir(name, store_dir)
+    os.makedirs(table_dir, exist_ok=True)
+
+    old_manifest = read_manifest(name, store_dir)
+    generation = old_manifest['generation'] + 1 if old_manifest else 0
+    part_name = f'part-{generation:05d}'
+
+    columns = {col: _column_schema(df[col]) for col in df.columns}
+    part = _write_partition(table_dir, part_name, df, columns)
+    _write_manifest(table_dir, {
+        'generation': generation,
+        'columns': columns,
+        'partitions': [part],
+        'metadata': metadata or {},
+    })
+
+    # Old partitions are unreferenced now that the manifest has moved on; a reader
+    # still holding the old manifest retries with the new one in read_table
+    if old_manifest:
+        for old_part in old_manifest['partitions']:
+            _remove_partition(table_dir, old_part['name'])
+
+def append_table(df, name, store_dir=None, metadata=None):
+    """Add df as a new partition; the schema must match the existing table"""
+    upsert_table(df, name, keys=None, store_dir=store_dir, metadata=metadata)
+
+def upsert_table(df, name, keys=('ticker', 'date'), store_dir=None, metadata=None):
+    """Add df as a new partition, hiding existing rows whose keys reappear in df.
+
+    Superseded rows stay on disk but are listed under their partition's
+    'dropped' entry, so only partitions whose date range overlaps df are
+    scanned and nothing already written is rewritten. Once the table holds
+    too many partitions or dropped rows it is compacted.
+    """
+    manifest = read_manifest(name, store_dir)
+    if manifest is None:
+        write_table(df, name, store_dir, metadata)
+        return
+
+    missing = set(manifest['columns']) - set(df.columns)
+    if missing:
+        raise ValueError(f"Cannot append to {name}: missing columns {sorted(missing)}")
+
+    table_dir = _table_dir(name, store_dir)
+    if keys and len(df):
+        new_keys = pd.MultiIndex.from_frame(df[list(keys)].astype(
+            {k: str for k in keys if manifest['columns'][k]['kind'] == 'category'}))
+        min_date = str(df['date'].min().date()) if 'date' in keys else None
+        for part in manifest['partitions']:
+            if min_date and part.get('max_date', min_date) < min_date:
+                continue
+            old_keys = pd.MultiIndex.from_arrays([
+                _load_column(table_dir, part, k, manifest['columns'][k], mmap_mode='r', apply_drops=False)
+                for k in keys
+            ])
+            hits = np.flatnonzero(old_keys.isin(new_keys))
+            if len(hits):
+                part['dropped'] = sorted(set(part.get('dropped', [])) | set(hits.tolist()))
+
+    if len(df):
+        generation = manifest['generation'] + 1
+        part_name = f'part-{generation:05d}'
+        manifest['partitions'].append(_write_partition(table_dir, part_name, df, manifest['columns']))
+        manifest['generation'] = generation
+    manifest.setdefault('metadata', {}).update(metadata or {})
+    _write_manifest(table_dir, manifest)
+
+    if _needs_compaction(manifest):
+        compact_table(name, store_dir)
+
+def _needs_compaction(manifest):
+    partitions = manifest['partitions']
+    rows = sum(part['rows'] for part in partitions)
+    dropped = sum(len(part.get('dropped', [])) for part in partitions)
+    return (len(partitions) > COMPACT_MAX_PARTITIONS
+            or (rows and dropped / rows > COMPACT_MAX_DROPPED_FRACTION))
+
+def compact_table(name, store_dir=None):
+    """Rewrite a table as a single partition without its dropped rows"""
+    # Read into memory: write_table deletes the partitions a mapping would point at
+    df = read_table(name, mmap_mode=None, store_dir=store_dir)
+    write_table(df, name, store_dir, metadata=read_metadata(name, store_dir))
+
+def _remove_partition(table_dir, part_name):
+    part_dir = os.path.join(table_dir, part_name)
+    if not os.path.isdir(part_dir):
+        return
+    for f in os.listdir(part_dir):
+        os.remove(os.path.join(part_dir, f))
+    os.rmdir(part_dir)
+
+def _load_column(table_dir, part, col, schema, mmap_mode='r', apply_drops=True, decode=True):
+    values = np.load(os.path.join(table_dir, part['name'], f'{col}.npy'), mmap_mode=mmap_mode)
+    if apply_drops and part.get('dropped'):
+        values = np.delete(values, part['dropped'])
+    if decode and schema['kind'] == 'category':
+        values = pd.Categorical.from_codes(values, categories=schema['categories'])
+    return values
+
+def read_table(name, columns=None, mmap_mode='r', store_dir=None):
+    """Load a table, memory-mapping only the requested columns"""
+    manifest = read_manifest(name, store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Feature store table '{name}' not found")
+
+    table_dir = _table_dir(name, store_dir)
+    try:
+        return _read_partitions(table_dir, manifest, columns, mmap_mode)
+    except FileNotFoundError:
+        # write_table (or a compaction) swapped the manifest and removed the
+        # partitions of the one read above; its replacement is already complete
+        fresh = read_manifest(name, store_dir)
+        if fresh is None or fresh['generation'] == manifest['generation']:
+            raise
+        return _read_partitions(table_dir, fresh, columns, mmap_mode)
+
+def _read_partitions(table_dir, manifest, columns, mmap_mode):
+    columns = columns or list(manifest['columns'])
+    partitions = manifest['partitions']
+    data = {}
+    for col in columns:
+        schema = manifest['columns'][col]
+        parts = [_load_column(table_dir, part, col, schema, mmap_mode, decode=False) for part in partitions]
+        # A single untouched partition stays a zero-copy view of the mapped file
+        values = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        if schema['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, categories=schema['categories'])
+        data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+def high_water_marks(df):
+    """Latest stored date per ticker, kept in the manifest for incremental builds"""
+    return {ticker: str(d.date()) for ticker, d in df.groupby('ticker', observed=True)['date'].max().items()}
+
+def read_metadata(name, store_dir=None):
+    manifest = read_manifest(name, store_dir)
+    return manifest.get('metadata', {}) if manifest else {}
+
+def load_features(columns=None, name='features_with_events'):
+    """Read the feature table, converting it from CSV first if the store is missing or stale"""
+    csv_path = os.path.join(DATA_DIR, f'{name}.csv')
+    manifest_path = os.path.join(_table_dir(name), MANIFEST)
+    if not os.path.exists(manifest_path) or (
+            os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(manifest_path)):
+        print(f"Converting {csv_path} to feature store...")
+        df = pd.read_csv(csv_path, parse_dates=['date'])
+        write_table(df, name, metadata={'high_water': high_water_marks(df)})
+    return read_table(name, columns)
+
+if __name__ == "__main__":
+    df = load_features()
+    print(f"✅ Feature store ready: {df.shape[0]} rows, {df.shape[1]} columns")
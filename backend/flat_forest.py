@@ -0,0 +1,120 @@
+import hashlib
+import numpy as np
+import joblib
+
+# Packed layout: the nodes of every tree are concatenated into flat arrays and
+# child pointers are rewritten as offsets into them, so all trees can be walked
+# together with a handful of numpy gathers per level.
+#
+#   feature[n]    split feature of node n (0 for leaves)
+#   threshold[n]  go left when x[feature] <= threshold (+inf for leaves)
+#   left[n]       global index of the left child (leaves point to themselves)
+#   right[n]      global index of the right child (leaves point to themselves)
+#   proba[n]      class probabilities of node n, already normalized per tree
+#   roots[t]      index of the root of tree t
+#
+# An export also records the sha1 of the model pickle it was taken from, so a
+# server can tell that it is current without unpickling the model.
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def export_forest(model, model_sha1=None):
+    """Pack a fitted single-output RandomForestClassifier into flat arrays"""
+    if model.n_outputs_ != 1:
+        raise ValueError("Only single-output forests can be exported")
+
+    features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        idx = np.arange(n)
+        is_leaf = tree.children_left == -1
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, idx, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, idx, tree.children_right) + offset)
+
+        # Same per-tree normalization as DecisionTreeClassifier.predict_proba
+        value = tree.value[:, 0, :]
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        probas.append(value / normalizer)
+
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'left': np.concatenate(lefts).astype(np.intp),
+        'right': np.concatenate(rights).astype(np.intp),
+        'proba': np.concatenate(probas).astype(np.float64),
+        'roots': np.array(roots, dtype=np.intp),
+        'classes': np.asarray(model.classes_),
+        'feature_importances': np.asarray(model.feature_importances_, dtype=np.float64),
+        'max_depth': max_depth,
+        'n_features': model.n_features_in_,
+        'model_sha1': model_sha1,
+    }
+
+class FlatForest:
+    """Forest inference over arrays produced by export_forest.
+
+    predict_proba matches the source RandomForestClassifier within float
+    tolerance; it avoids sklearn's per-call validation and per-tree dispatch,
+    which dominate when scoring a single row. It also exposes classes_ and
+    feature_importances_, so it can stand in for the model in StockPredictor.
+    """
+
+    def __init__(self, arrays):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.proba = arrays['proba']
+        self.roots = arrays['roots']
+        self.classes_ = arrays['classes']
+        self.feature_importances_ = arrays['feature_importances']
+        self.max_depth = int(arrays['max_depth'])
+        self.n_features = int(arrays['n_features'])
+        self.model_sha1 = arrays.get('model_sha1')
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(export_forest(model))
+
+    @classmethod
+    def load(cls, path):
+        # Saved uncompressed, so the node arrays stay memory-mapped: unlike sklearn
+        # trees, which copy their nodes on unpickling, every process shares one copy
+        return cls(joblib.load(path, mmap_mode='r'))
+
+    def apply(self, X):
+        """Leaf index reached in every tree, shape (n_rows, n_trees)"""
+        # sklearn compares float32-cast inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        # Leaves loop back to themselves, so walking max_depth levels lands every row on its leaf
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        return self.proba[self.apply(X)].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
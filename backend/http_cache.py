@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import HTTP_CACHE_DIR
+from async_fetcher import FetchResult
+
+# How long a page that can still change is served without revalidation
+DEFAULT_TTL = 6 * 60 * 60
+
+# Each URL is cached under the SHA-1 of the URL:
+#
+#   http_cache/ab/ab12....json          status, validators, fetched_at, body hash
+#   http_cache/ab/ab12....body          raw response body
+#   http_cache/ab/ab12....<parser>.json parsed items, tied to the body hash
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+def _write_atomic(path, data):
+    # A unique temp name per writer, so concurrent fetches of one URL never share a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+class HttpCache:
+    """On-disk response cache keyed by URL, with ETag/Last-Modified validators"""
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _path(self, url, suffix):
+        key = _digest(url.encode('utf-8'))
+        return os.path.join(self.cache_dir, key[:2], key + suffix)
+
+    def load_meta(self, url):
+        path = self._path(url, '.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, url, meta):
+        _write_atomic(self._path(url, '.json'), json.dumps(meta).encode('utf-8'))
+
+    def load(self, url, meta):
+        with open(self._path(url, '.body'), 'rb') as f:
+            body = f.read()
+        return FetchResult(url, meta['status'], meta['headers'], body, meta['encoding'])
+
+    def store(self, url, result):
+        os.makedirs(os.path.dirname(self._path(url, '')), exist_ok=True)
+        # Body first, so metadata never points at a body that is not on disk
+        _write_atomic(self._path(url, '.body'), result.body)
+        meta = {
+            'url': url,
+            'status': result.status,
+            'headers': {k: v for k, v in result.headers.items() if k.lower() in ('content-type', 'etag', 'last-modified')},
+            'encoding': result.encoding,
+            'etag': result.headers.get('ETag'),
+            'last_modified': result.headers.get('Last-Modified'),
+            'sha1': _digest(result.body),
+            'fetched_at': time.time()
+        }
+        self._write_meta(url, meta)
+        return meta
+
+    def touch(self, url, meta):
+        """Record a successful revalidation (304) so the TTL restarts"""
+        meta['fetched_at'] = time.time()
+        self._write_meta(url, meta)
+
+    def is_fresh(self, meta, closed_at=None, now=None):
+        """closed_at marks when the page stopped changing (e.g. the end of a past
+        month); a copy fetched after it is immutable and never refetched."""
+        if closed_at is not None and meta['fetched_at'] >= closed_at.timestamp():
+            return True
+        now = time.time() if now is None else now
+        return now - meta['fetched_at'] < self.ttl
+
+    def load_parsed(self, url, parser_key, body_sha1):
+        path = self._path(url, f'.{parser_key}.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            parsed = json.load(f)
+        return parsed['items'] if parsed['sha1'] == body_sha1 else None
+
+    def store_parsed(self, url, parser_key, body_sha1, items):
+        payload = json.dumps({'sha1': body_sha1, 'items': items}, default=str)
+        _write_atomic(self._path(url, f'.{parser_key}.json'), payload.encode('utf-8'))
+
+class CachedFetcher:
+    """Wraps an AsyncFetcher with an HttpCache.
+
+    Fresh entries are served from disk, stale ones are revalidated with
+    If-None-Match / If-Modified-Since, and fetch_parsed also caches the
+    parser's output so unchanged pages are never parsed twice. When a
+    revalidation fails (an error status or connection error once the
+    fetcher's retries run out) the stale copy is served instead.
+    """
+
+    def __init__(self, fetcher, cache):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.hits = 0
+        self.revalidated = 0
+        self.stale = 0
+        self.misses = 0
+
+    async def fetch(self, url, closed_at=None):
+        meta = self.cache.load_meta(url)
+        if meta is not None and self.cache.is_fresh(meta, closed_at):
+            self.hits += 1
+            return self.cache.load(url, meta)
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        try:
+            result = await self.fetcher.fetch(url, headers=headers or None)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if meta is None:
+                raise
+            result = None
+        if meta is not None:
+            if result is not None and result.status == 304:
+                self.revalidated += 1
+                self.cache.touch(url, meta)
+                return self.cache.load(url, meta)
+            if result is None or result.status != 200:
+                # Keep fetched_at as is, so the next run tries to revalidate again
+                self.stale += 1
+                return self.cache.load(url, meta)
+
+        self.misses += 1
+        if result.status == 200:
+            self.cache.store(url, result)
+        return result
+
+    async def fetch_all(self, urls):
+        return await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+
+    async def fetch_parsed(self, url, parse, parser_key, closed_at=None):
+        """parse(FetchResult) -> JSON-serializable items, cached per body and parser_key.
+
+        Bump parser_key when the parser changes so old parsed output is ignored.
+        Values JSON cannot hold (dates) come back as strings from the cache.
+        """
+        meta = self.cache.load_meta(url)
+        if meta is not None and self.cache.is_fresh(meta, closed_at):
+            items = self.cache.load_parsed(url, parser_key, meta['sha1'])
+            if items is not None:
+                self.hits += 1
+                return items
+
+        result = await self.fetch(url, closed_at)
+        body_sha1 = _digest(result.body)
+        items = self.cache.load_parsed(url, parser_key, body_sha1)
+        if items is None:
+            items = parse(result)
+            if result.status == 200:
+                self.cache.store_parsed(url, parser_key, body_sha1, items)
+        return items
+
+    def summary(self):
+        return (f"{self.hits} cached, {self.revalidated} revalidated (304), "
+                f"{self.stale} stale after failed revalidation, {self.misses} downloaded")
@@ -0,0 +1,120 @@
+from bisect import bisect_right
+from collections import deque
+import numpy as np
+import pandas as pd
+
+class KeywordMatcher:
+    """Case-insensitive Aho-Corasick automaton over labelled keyword groups.
+
+    groups maps a label (usually a ticker) to its keywords. The automaton is
+    compiled once; scanning a text is a single pass over its characters and
+    reports every keyword occurrence, including overlapping ones such as
+    'bajaj finance' and 'bajaj', so results match per-keyword substring
+    counting while the cost no longer grows with the number of keywords.
+    """
+
+    def __init__(self, groups):
+        self.groups = {label: list(kws) for label, kws in groups.items()}
+        self.keywords = []
+        self.keyword_labels = {}
+        for label, kws in self.groups.items():
+            for kw in kws:
+                kw = kw.lower()
+                if kw not in self.keyword_labels:
+                    self.keyword_labels[kw] = []
+                    self.keywords.append(kw)
+                if label not in self.keyword_labels[kw]:
+                    self.keyword_labels[kw].append(label)
+        self._build()
+
+    def _build(self):
+        # 1. Trie of all keywords
+        goto = [{}]
+        out = [[]]
+        for i, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    out.append([])
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            out[state].append(i)
+
+        # 2. Failure links in BFS order, folded into a full transition table so
+        # scanning needs exactly one dict lookup per character
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque()
+        for state in goto[0].values():
+            queue.append(state)
+        while queue:
+            r = queue.popleft()
+            delta[r] = {**delta[fail[r]], **goto[r]}
+            for ch, s in goto[r].items():
+                fail[s] = delta[fail[r]].get(ch, 0) if r else 0
+                out[s] = out[s] + out[fail[s]]
+                queue.append(s)
+
+        self._delta = delta
+        self._out = out
+
+    def keyword_counts(self, text):
+        """Occurrences of each matched keyword (lowercased) in text"""
+        delta, out = self._delta, self._out
+        counts = {}
+        state = 0
+        for ch in str(text).lower():
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                for i in out[state]:
+                    counts[i] = counts.get(i, 0) + 1
+        return {self.keywords[i]: n for i, n in counts.items()}
+
+    def counts(self, text):
+        """Total keyword hits per label, for labels with at least one hit"""
+        totals = {}
+        for kw, n in self.keyword_counts(text).items():
+            for label in self.keyword_labels[kw]:
+                totals[label] = totals.get(label, 0) + n
+        return totals
+
+    def labels(self, text):
+        """Labels with any hit, in registry order"""
+        hits = self.counts(text)
+        return [label for label in self.groups if label in hits]
+
+    def keyword_masks(self, texts):
+        """Vectorized presence test over a Series of texts: one bool column per keyword.
+
+        The lowercased texts are joined into one NUL-separated string, so each
+        keyword is a C-level str.find scan of the whole column that jumps to the
+        next row after a hit; Python only touches rows that actually match.
+        """
+        lowered = [str(t).lower() for t in texts.fillna('').tolist()]
+        lengths = np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered))
+        ends = np.cumsum(lengths + 1)
+        starts = (ends - lengths - 1).tolist()
+        ends = ends.tolist()
+        blob = '\0'.join(lowered)
+
+        masks = {}
+        for kw in self.keywords:
+            mask = np.zeros(len(lowered), dtype=bool)
+            pos = blob.find(kw)
+            while pos != -1:
+                row = bisect_right(starts, pos) - 1
+                mask[row] = True
+                pos = blob.find(kw, ends[row])
+            masks[kw] = mask
+        return pd.DataFrame(masks, index=texts.index)
+
+    def label_masks(self, keyword_masks):
+        """Collapse keyword_masks output to one bool column per label (any of its keywords)"""
+        return pd.DataFrame(
+            {label: keyword_masks[[kw.lower() for kw in kws]].any(axis=1) for label, kws in self.groups.items()},
+            index=keyword_masks.index
+        )
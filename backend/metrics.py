@@ -0,0 +1,149 @@
+import bisect
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+
+# Upper bounds in seconds; from sub-millisecond cache hits to multi-second batch calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROFILE_HEADER = 'X-Profile'
+
+class Histogram:
+    """Prometheus-style histogram: per-bucket counts plus running sum and count"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+def _format_labels(labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels)
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+class MetricsRegistry:
+    """Request and phase latency histograms for one process.
+
+    Under the pre-fork server every worker keeps its own registry, so
+    /metrics reports the worker that answered the scrape; tell series apart
+    by scraping each worker or adding the instance label on the Prometheus side.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._phases = {}
+
+    def _observe(self, series, labels, seconds):
+        with self._lock:
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def observe_request(self, route, method, status, seconds):
+        self._observe(self._requests, (('route', route), ('method', method), ('status', str(status))), seconds)
+
+    def observe_phase(self, phase, seconds, route=None):
+        """Record a phase timed elsewhere; route defaults to the current request's"""
+        route = route or _current_route() or ''
+        self._observe(self._phases, (('route', route), ('phase', phase)), seconds)
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase `name` of the current request's route"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_phase(name, time.perf_counter() - start)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric, help_text, series in (
+            ('stockapi_request_duration_seconds', 'Request latency by route, method and status.', self._requests),
+            ('stockapi_phase_duration_seconds', 'Latency of request phases (feature lookup, inference, serialization).', self._phases),
+        ):
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            with self._lock:
+                snapshot = [(labels, list(h.cumulative()), h.sum, h.count) for labels, h in sorted(series.items())]
+            for labels, buckets, total, count in snapshot:
+                label_str = _format_labels(labels)
+                for bound, cumulative in buckets:
+                    lines.append(f'{metric}_bucket{{{label_str},le="{_format_bound(bound)}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{{label_str}}} {total!r}')
+                lines.append(f'{metric}_count{{{label_str}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+def _current_route():
+    try:
+        rule = request.url_rule
+    except RuntimeError:  # outside a request
+        return None
+    return rule.rule if rule is not None else 'unmatched'
+
+def instrument_app(app, registry, profile_dir=None):
+    """Time every request of `app` into `registry` and serve it at /metrics.
+
+    With profile_dir set, a request carrying the X-Profile header runs under
+    cProfile and its stats are written to profile_dir; the response names the
+    file in the same header. Without it the header is ignored and the only
+    per-request cost is two perf_counter calls and a histogram update.
+    """
+
+    @app.before_request
+    def start_timer():
+        if profile_dir and request.headers.get(PROFILE_HEADER):
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('request_start', None)
+        if start is not None:
+            registry.observe_request(_current_route(), request.method, response.status_code,
+                                     time.perf_counter() - start)
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            name = (_current_route() or 'unmatched').strip('/').replace('/', '_').replace('<', '').replace('>', '')
+            path = os.path.join(profile_dir, f"{name or 'root'}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(profiler):x}.prof")
+            profiler.dump_stats(path)
+            response.headers[PROFILE_HEADER] = path
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc=None):
+        # after_request is skipped when a view raises; never leave the profiler running
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return app.response_class(registry.render(), mimetype='text/plain; version=0.0.4')
+
+    return registry
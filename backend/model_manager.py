@@ -0,0 +1,170 @@
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import MODEL_PATH
+from trainer import train_model
+from predictor import StockPredictor
+from training_jobs import JobStore
+
+# How often request threads check whether another process replaced the model file
+RELOAD_CHECK_INTERVAL = 5.0
+
+def _model_mtime():
+    try:
+        return os.path.getmtime(MODEL_PATH)
+    except OSError:
+        return None
+
+class ModelManager:
+    """Versioned handle around the live StockPredictor.
+
+    Retraining runs in a separate worker process; once it finishes, the new
+    model and feature index are loaded on the executor's callback thread and
+    swapped in with a single reference assignment, so request threads always
+    see either the old or the new predictor, never a partial one.
+
+    Each published model also gets serialized JSON responses for the read-only
+    endpoints, keyed by (model version, route, ticker); they are rebuilt only
+    when a retrained model is swapped in.
+
+    Under a pre-fork server every worker holds its own manager, so workers
+    also watch the model file and reload when a sibling's retrain replaces it.
+    Job records live in a JobStore shared by all workers, so any worker can
+    answer /train/<job_id> and only one job runs at a time.
+    """
+
+    def __init__(self, loader=StockPredictor, jobs=None):
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._responses = {}
+        self._last_check = time.monotonic()
+        self._reloading = False
+        self._active = (0, None)
+        mtime = _model_mtime()
+        self._publish(loader(), mtime)
+        self._executor = None
+        self._running_job = None
+        self.jobs = jobs or JobStore()
+
+    def current(self):
+        """Return (version, predictor) for the model serving requests right now"""
+        return self._active
+
+    @property
+    def predictor(self):
+        return self._active[1]
+
+    def _publish(self, predictor, mtime):
+        """Swap in predictor under the next version number and return that version"""
+        # Serialize before taking the lock so requests keep being served meanwhile
+        bodies = {
+            key: json.dumps(payload, separators=(',', ':'))
+            for key, payload in predictor.response_payloads().items()
+        }
+        with self._lock:
+            # Numbered under the lock, so a reload and a finished job never share a version
+            version = self._active[0] + 1
+            self._active = (version, predictor)
+            self._responses = {(version, route, ticker): body for (route, ticker), body in bodies.items()}
+            self._model_mtime = mtime
+        return version
+
+    def cached_response(self, route, ticker=None):
+        """Precomputed JSON body for route/ticker under the active model, or None on a miss"""
+        version, predictor = self._active
+        key = (version, route, predictor.ticker_key(ticker) if ticker else None)
+        return self._responses.get(key)
+
+    def reload_if_changed(self):
+        """Reload in the background if the model file changed since it was loaded.
+
+        Cheap enough to call on every request: the file is stat'ed at most
+        once per RELOAD_CHECK_INTERVAL.
+        """
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        with self._lock:
+            if now - self._last_check < RELOAD_CHECK_INTERVAL:
+                return
+            self._last_check = now
+            mtime = _model_mtime()
+            # A local training job publishes its own model when it finishes
+            if (self._reloading or self._running_job is not None
+                    or mtime is None or mtime == self._model_mtime):
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(mtime,), daemon=True).start()
+
+    def _reload(self, mtime):
+        try:
+            self._publish(self.loader(), mtime)
+        except Exception as e:
+            print(f"❌ Model reload failed: {e}")
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def start_training(self):
+        """Submit a retrain job and return its id; reuse the running job if there is one"""
+        with self._lock:
+            if self._running_job is not None:
+                return self._running_job
+
+            if self._executor is None:
+                # Spawn rather than fork: forking this multithreaded server (with
+                # this lock held) could leave the child holding locks nobody releases
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+
+            job_id, created = self.jobs.claim()
+            if not created:
+                return job_id
+            self._running_job = job_id
+
+            try:
+                future = self._executor.submit(train_model)
+            except Exception as e:
+                # A training child that died (e.g. OOM-killed) leaves the pool broken;
+                # fail this job and start a fresh pool for the next one
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                self.jobs.finish(job_id, 'failed', error=str(e) or type(e).__name__)
+                self._running_job = None
+                return job_id
+
+        future.add_done_callback(lambda f: self._finish_training(job_id, f))
+        return job_id
+
+    def _finish_training(self, job_id, future):
+        try:
+            future.result()
+            # Load model and build the feature index before publishing them
+            mtime = _model_mtime()
+            version = self._publish(self.loader(), mtime)
+            self.jobs.finish(job_id, 'completed', model_version=version)
+        except Exception as e:
+            self.jobs.finish(job_id, 'failed', error=str(e) or type(e).__name__)
+            if isinstance(e, BrokenProcessPool):
+                with self._lock:
+                    if self._executor is not None:
+                        self._executor.shutdown(wait=False)
+                        self._executor = None
+        finally:
+            with self._lock:
+                self._running_job = None
+
+    def get_job(self, job_id):
+        return self.jobs.get(job_id)
@@ -0,0 +1,201 @@
+import glob
+import hashlib
+import os
+import sqlite3
+import sys
+import pandas as pd
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import NEWS_CSV_PATH, NEWS_STORE_DIR
+from bulk_loader import LOOKUP_CHUNK
+
+NEWS_COLUMNS = ['Date', 'Title', 'Description', 'Source', 'Ticker']
+INDEX_DB = 'title_index.db'
+
+# Headlines are stored as append-only monthly CSV partitions next to a SQLite
+# index of headline keys, so merging a batch only reads and writes that batch.
+# A key is the hash of (normalized title, ticker, day): the same headline filed
+# under several tickers is kept once per ticker, matching the old
+# drop_duplicates(['Date', 'Title', 'Ticker']) of the scraper.
+#
+#   news_store/
+#       title_index.db
+#       news-2024-01.csv, news-2024-02.csv, ...
+
+def normalize_title(title):
+    return ' '.join(str(title).lower().split())
+
+def headline_key(title, ticker, day):
+    raw = '\x1f'.join([normalize_title(title), ticker, day])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def _headline_keys(df):
+    days = df['Date'].dt.strftime('%Y-%m-%d')
+    tickers = df['Ticker'].fillna('').astype(str)
+    return pd.Series(
+        [headline_key(t, k, d) for t, k, d in zip(df['Title'], tickers, days)],
+        index=df.index, dtype=object
+    )
+
+def _wall_clock(value):
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return pd.NaT
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
+
+def _to_naive_dates(values):
+    # Keep the wall-clock time so headlines stay on their local trading day
+    try:
+        # format='mixed' parses each value on its own; an inferred format would
+        # turn dates written differently from the first row into NaT
+        dates = pd.to_datetime(values, errors='coerce', format='mixed')
+    except ValueError:
+        # Mixed UTC offsets cannot share one dtype; strip each value's own offset
+        return pd.to_datetime(values.map(_wall_clock), errors='coerce')
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates
+
+class NewsStore:
+    """Deduplicated headline store: monthly CSV partitions plus a persistent headline-key index"""
+
+    def __init__(self, store_dir=NEWS_STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(store_dir, INDEX_DB))
+        self.conn.execute("CREATE TABLE IF NOT EXISTS headlines (hash TEXT PRIMARY KEY, month TEXT NOT NULL)")
+        legacy = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'titles'"
+        ).fetchone()
+        if legacy:
+            # Stores created before keys included ticker and day held title-only hashes
+            self.rebuild_index()
+            self.conn.execute("DROP TABLE titles")
+        self.conn.commit()
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM headlines").fetchone()[0]
+
+    def rebuild_index(self):
+        """Recompute the key index from the stored partitions"""
+        self.conn.execute("DELETE FROM headlines")
+        for month in self.months():
+            part = pd.read_csv(self.partition_path(month))
+            part['Date'] = pd.to_datetime(part['Date'], format='ISO8601')
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO headlines (hash, month) VALUES (?, ?)",
+                ((key, month) for key in _headline_keys(part))
+            )
+        self.conn.commit()
+
+    def _known(self, hashes):
+        known = set()
+        for start in range(0, len(hashes), LOOKUP_CHUNK):
+            chunk = hashes[start:start + LOOKUP_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT hash FROM headlines WHERE hash IN ({', '.join(['?'] * len(chunk))})", chunk
+            ).fetchall()
+            known.update(h for (h,) in rows)
+        return known
+
+    def partition_path(self, month):
+        return os.path.join(self.store_dir, f"news-{month}.csv")
+
+    def add(self, df):
+        """Append headlines whose (normalized title, ticker, day) is not stored yet; returns the rows added.
+
+        Rows without a parseable date are dropped, and within the batch the
+        first occurrence of a key wins, as with drop_duplicates(keep='first').
+        """
+        batch = df.reindex(columns=NEWS_COLUMNS).reset_index(drop=True)
+        batch['Date'] = _to_naive_dates(batch['Date'])
+        batch = batch.dropna(subset=['Date', 'Title'])
+        batch['Title'] = batch['Title'].astype(str)
+        batch['Description'] = batch['Description'].fillna(batch['Title'])
+
+        hashes = _headline_keys(batch)
+        batch = batch[~hashes.duplicated()]
+        hashes = hashes[batch.index]
+
+        known = self._known(hashes.unique().tolist())
+        is_new = ~hashes.isin(known)
+        batch, hashes = batch[is_new], hashes[is_new]
+        if batch.empty:
+            return batch
+
+        batch = batch.sort_values('Date', kind='mergesort')
+        months = batch['Date'].dt.strftime('%Y-%m')
+        for month, part in batch.groupby(months, sort=True):
+            path = self.partition_path(month)
+            part.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+        # Index only after the partitions are written, so a crash never hides headlines
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO headlines (hash, month) VALUES (?, ?)",
+            zip(hashes[batch.index].tolist(), months.tolist())
+        )
+        self.conn.commit()
+        return batch
+
+    def import_csv(self, path, chunk_size=50_000, transform=None, **read_kwargs):
+        """Stream a legacy single-file news CSV into the store; returns the number of rows added.
+
+        transform, if given, is applied to each chunk before it is added.
+        """
+        added = 0
+        for chunk in pd.read_csv(path, chunksize=chunk_size, **read_kwargs):
+            chunk['Title'] = chunk['Title'].fillna('').astype(str)
+            if 'Description' not in chunk.columns:
+                chunk['Description'] = chunk['Title']
+            chunk['Description'] = chunk['Description'].fillna('').astype(str)
+            if transform is not None:
+                chunk = transform(chunk)
+            added += len(self.add(chunk))
+        return added
+
+    def months(self):
+        paths = sorted(glob.glob(os.path.join(self.store_dir, 'news-*.csv')))
+        return [os.path.basename(p)[len('news-'):-len('.csv')] for p in paths]
+
+    def read(self, start=None, end=None):
+        """Headlines between start and end (inclusive), read only from the months that overlap"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        frames = []
+        for month in self.months():
+            if start is not None and month < start.strftime('%Y-%m'):
+                continue
+            if end is not None and month > end.strftime('%Y-%m'):
+                continue
+            frames.append(pd.read_csv(self.partition_path(month)))
+        if not frames:
+            return pd.DataFrame(columns=NEWS_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True)
+        df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')
+        if start is not None:
+            df = df[df['Date'] >= start]
+        if end is not None:
+            df = df[df['Date'] < end.normalize() + pd.Timedelta(days=1)]
+        return df.sort_values('Date', kind='mergesort').reset_index(drop=True)
+
+    def close(self):
+        self.conn.close()
+
+def load_news(store_dir=NEWS_STORE_DIR, csv_path=NEWS_CSV_PATH):
+    """All stored headlines, falling back to the legacy single CSV before the store exists"""
+    if os.path.exists(os.path.join(store_dir, INDEX_DB)):
+        store = NewsStore(store_dir)
+        try:
+            return store.read()
+        finally:
+            store.close()
+    df = pd.read_csv(csv_path)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    return df
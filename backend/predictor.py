@@ -1,7 +1,9 @@
 import pandas as pd
+import numpy as np
 import joblib
 import os
 import sys
+import time
 
 # Add project root to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,43 +11,126 @@ project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from config import DATA_DIR, MODEL_PATH
+from config import MODEL_PATH, FOREST_PATH, STOCK_SYMBOLS, USE_FLAT_FOREST
+from feature_store import load_features
+from flat_forest import FlatForest, file_sha1
 
 class StockPredictor:
-    def __init__(self):
-        self.model = joblib.load(MODEL_PATH)
+    def __init__(self, use_flat_forest=USE_FLAT_FOREST):
+        # Either engine provides predict_proba, classes_ and feature_importances_
+        self.model = self.load_flat_forest() if use_flat_forest else joblib.load(MODEL_PATH)
         self.features = [
             'close_price','sentiment_score','usd_inr_rate','interest_rate',
             'unemployment_rate','days_to_next_event','days_since_last_event',
             'is_event_window','event_impact_score'
         ]
-        data_path = os.path.join(DATA_DIR, 'features_with_events.csv')
-        self.data = pd.read_csv(data_path, parse_dates=['date'])
+        self.data = load_features(['date', 'ticker'] + self.features)
+        self.index = self.build_index(self.data)
+
+    def load_flat_forest(self):
+        """Memory-mapped export of the current model, or one exported here if the trainer's is missing or stale"""
+        model_sha1 = file_sha1(MODEL_PATH)
+        if os.path.exists(FOREST_PATH):
+            forest = FlatForest.load(FOREST_PATH)
+            if forest.model_sha1 == model_sha1:
+                return forest
+        # Private to this process until the trainer writes a matching export
+        return FlatForest.from_model(joblib.load(MODEL_PATH))
+
+    def build_index(self, data):
+        """Group the feature table once into date-sorted per-ticker blocks"""
+        index = {}
+        data = data.sort_values(['ticker', 'date'], kind='mergesort')
+        for ticker, df_t in data.groupby('ticker', sort=False, observed=True):
+            features = np.ascontiguousarray(df_t[self.features].to_numpy(dtype=np.float64))
+            index[ticker] = {
+                'dates': df_t['date'].to_numpy(),
+                'close_price': df_t['close_price'].to_numpy(dtype=np.float64),
+                'features': features,
+                'latest': features[-1:].copy(),
+            }
+        return index
+
+    @staticmethod
+    def ticker_key(ticker):
+        # Remove .NS suffix if present
+        return ticker.replace('.NS', '')
+
+    def get_ticker_block(self, ticker):
+        block = self.index.get(self.ticker_key(ticker))
+        if block is None:
+            available_str = ", ".join(self.index)
+            raise ValueError(f"Ticker {ticker} not found. Available tickers: {available_str}")
+        return block
 
     def get_latest_features(self, ticker):
-        df_t = self.data[self.data['ticker']==ticker].sort_values('date').iloc[-1]
-        return df_t[self.features].values.reshape(1,-1)
+        return self.get_ticker_block(ticker)['latest']
 
-    def predict(self, ticker):
-        try:
-            # Remove .NS suffix if present
-            clean_ticker = ticker.replace('.NS', '')
+    def get_price_history(self, ticker, days=30):
+        block = self.get_ticker_block(ticker)
+        dates = pd.DatetimeIndex(block['dates'][-days:])
+        return dates.strftime('%Y-%m-%d').tolist(), block['close_price'][-days:].tolist()
+
+    def get_feature_importances(self, ticker=None):
+        """Forest importances, rescaled by the ticker's latest feature values when a ticker is given"""
+        importances = self.model.feature_importances_.tolist()
+        
+        if ticker:
+            # Get feature values for the specific ticker
+            feature_values = self.get_latest_features(ticker)[0].tolist()
             
-            # Check if ticker exists in the data
-            available_tickers = self.data['ticker'].unique()
-            if clean_ticker not in available_tickers:
-                available_str = ", ".join(available_tickers)
-                raise ValueError(f"Ticker {ticker} not found. Available tickers: {available_str}")
-                
-            X = self.get_latest_features(clean_ticker)
-            pred = int(self.model.predict(X)[0])
-            conf = float(self.model.predict_proba(X)[0][pred])
-            return pred, conf
+            # Scale importances based on feature values
+            scaled_importances = [imp * abs(val) for imp, val in zip(importances, feature_values)]
+            total = sum(scaled_importances)
+            if total > 0:  # Normalize
+                scaled_importances = [imp/total for imp in scaled_importances]
+            importances = scaled_importances
+        
+        return {'features': self.features, 'importances': importances}
+
+    def response_payloads(self, days=30):
+        """Payloads of the read-only dashboard endpoints for every ticker, keyed by (route, ticker)"""
+        payloads = {('feature_importances', None): self.get_feature_importances()}
+        for ticker in self.index:
+            payloads[('feature_importances', ticker)] = self.get_feature_importances(ticker)
+            dates, prices = self.get_price_history(ticker, days=days)
+            payloads[('price_history', ticker)] = {'dates': dates, 'prices': prices}
+        return payloads
+
+    def score(self, X):
+        """Run the forest once and derive both class and confidence from predict_proba"""
+        proba = self.model.predict_proba(X)
+        best = proba.argmax(axis=1)
+        preds = self.model.classes_[best]
+        confs = proba[np.arange(len(best)), best]
+        return preds, confs
+
+    def predict_timed(self, ticker):
+        try:
+            start = time.perf_counter()
+            X = self.get_latest_features(ticker)
+            lookup_done = time.perf_counter()
+            preds, confs = self.score(X)
+            inference_done = time.perf_counter()
+            timings = {
+                'feature_lookup_ms': (lookup_done - start) * 1000,
+                'inference_ms': (inference_done - lookup_done) * 1000,
+            }
+            return int(preds[0]), float(confs[0]), timings
         except Exception as e:
             raise ValueError(f"Error predicting for {ticker}: {str(e)}")
-            
-    def get_latest_features(self, ticker):
-        # Remove .NS suffix if present
-        clean_ticker = ticker.replace('.NS', '')
-        df_t = self.data[self.data['ticker']==clean_ticker].sort_values('date').iloc[-1]
-        return df_t[self.features].values.reshape(1,-1)
+
+    def predict(self, ticker):
+        pred, conf, _ = self.predict_timed(ticker)
+        return pred, conf
+
+    def predict_many(self, tickers=None):
+        """Score the latest rows of several tickers with one predict_proba call"""
+        if tickers is None:
+            tickers = STOCK_SYMBOLS
+        try:
+            X = np.vstack([self.get_latest_features(t) for t in tickers])
+            preds, confs = self.score(X)
+            return [(t, int(p), float(c)) for t, p, c in zip(tickers, preds, confs)]
+        except Exception as e:
+            raise ValueError(f"Error predicting batch: {str(e)}")
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import SENTIMENT_CACHE_PATH
+from sentiment_scoring import score_headlines
+from bulk_loader import LOOKUP_CHUNK
+
+def normalize_headline(text):
+    # VADER splits on whitespace and is case sensitive, so only whitespace is normalized
+    return ' '.join(str(text).split())
+
+def analyzer_version(analyzer):
+    """Identify the scoring model so a lexicon/library upgrade never reuses old scores"""
+    module = type(analyzer).__module__.split('.')[0]
+    version = getattr(sys.modules.get(module), '__version__', 'unknown')
+    return f"{module}-{type(analyzer).__name__}-{version}"
+
+class SentimentCache:
+    """VADER compound scores cached by headline hash, in memory (LRU) and on disk (SQLite)"""
+
+    def __init__(self, analyzer=None, path=SENTIMENT_CACHE_PATH, max_memory=100_000, workers=1):
+        if analyzer is None:
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer
+            analyzer = SentimentIntensityAnalyzer()
+        self.analyzer = analyzer
+        self.version = analyzer_version(analyzer)
+        self.max_memory = max_memory
+        self.workers = workers
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_scores (key TEXT PRIMARY KEY, compound REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.version}\0{normalize_headline(text)}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key, score):
+        self.memory[key] = score
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_memory:
+            self.memory.popitem(last=False)
+
+    def compound(self, text):
+        return self.compound_many([text])[0]
+
+    def compound_many(self, texts):
+        """Return compound scores for texts, running VADER only on headlines never seen before"""
+        texts = [str(t) for t in texts]
+        keys = [self.key(t) for t in texts]
+        scores = {}
+
+        # 1. In-memory LRU
+        for k in set(keys):
+            if k in self.memory:
+                self.memory.move_to_end(k)
+                scores[k] = self.memory[k]
+
+        # 2. On-disk tier
+        missing = [k for k in set(keys) if k not in scores]
+        for start in range(0, len(missing), LOOKUP_CHUNK):
+            chunk = missing[start:start + LOOKUP_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT key, compound FROM sentiment_scores WHERE key IN ({', '.join(['?'] * len(chunk))})",
+                chunk
+            ).fetchall()
+            for k, score in rows:
+                scores[k] = score
+                self._remember(k, score)
+
+        # 3. Score what is left once per unique headline
+        unseen = {}
+        for k, text in zip(keys, texts):
+            if k not in scores and k not in unseen:
+                unseen[k] = normalize_headline(text)
+        new_scores = score_headlines(unseen.values(), workers=self.workers, analyzer=self.analyzer)
+        new_rows = list(zip(unseen, new_scores))
+        for k, score in new_rows:
+            scores[k] = score
+            self._remember(k, score)
+        if new_rows:
+            self.conn.executemany("INSERT OR REPLACE INTO sentiment_scores (key, compound) VALUES (?, ?)", new_rows)
+            self.conn.commit()
+
+        self.misses += len(new_rows)
+        self.hits += len(texts) - len(new_rows)
+        return [scores[k] for k in keys]
+
+    def close(self):
+        self.conn.close()
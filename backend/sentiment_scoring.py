@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Columns of sentiment_data filled from aggregate_daily beyond the original schema
+SENTIMENT_STAT_COLUMNS = {'min_score': 'DECIMAL(5,4)', 'max_score': 'DECIMAL(5,4)'}
+
+# One analyzer per worker process, set once by the pool initializer
+_worker_analyzer = None
+
+def _init_worker(analyzer=None):
+    global _worker_analyzer
+    if analyzer is None:
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        analyzer = SentimentIntensityAnalyzer()
+    _worker_analyzer = analyzer
+
+def _score_chunk(texts):
+    return [_worker_analyzer.polarity_scores(t)['compound'] for t in texts]
+
+def score_headlines(texts, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, analyzer=None):
+    """Return VADER compound scores for texts, in input order.
+
+    With workers > 1 the texts are split into chunks and scored across a
+    process pool; pool.map hands results back in chunk order. A custom
+    analyzer is pickled to every worker, so it must be picklable.
+    """
+    texts = list(texts)
+    if workers <= 1 or len(texts) <= chunk_size:
+        if analyzer is None:
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer
+            analyzer = SentimentIntensityAnalyzer()
+        return [analyzer.polarity_scores(t)['compound'] for t in texts]
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    scores = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(analyzer,)) as pool:
+        for chunk_scores in pool.map(_score_chunk, chunks):
+            scores.extend(chunk_scores)
+    return scores
+
+def aggregate_daily(df, ticker_col='ticker', date_col='date', score_col='score'):
+    """Reduce scored headlines to one row per (ticker, date) with mean/count/min/max compound scores"""
+    days = pd.to_datetime(df[date_col]).dt.date
+    return (df.assign(**{date_col: days})
+              .groupby([ticker_col, date_col], sort=True)[score_col]
+              .agg(sentiment_score='mean', news_count='count', min_score='min', max_score='max')
+              .reset_index()
+              .rename(columns={ticker_col: 'ticker', date_col: 'date'}))
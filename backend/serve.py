@@ -0,0 +1,72 @@
+"""Production server for the prediction API.
+
+Runs the Flask app under gunicorn's pre-fork worker model. The app module
+(and with it the joblib model, the feature index and the precomputed
+responses) is imported once in the master process; workers are forked from
+it and share those pages copy-on-write instead of each loading the model.
+
+    python backend/serve.py --workers 4 --port 8000
+
+The Flask dev server (python backend/app.py) remains for local debugging.
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+class PreloadedApplication(BaseApplication):
+    """gunicorn application wrapping an already-imported WSGI app"""
+
+    def __init__(self, application, options=None):
+        self.application = application
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the prediction API with pre-forked workers")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="Threads per worker; >1 switches to the gthread worker")
+    parser.add_argument('--timeout', type=int, default=60)
+    args = parser.parse_args()
+
+    # Load the model, feature index and cached responses once, in the master
+    from app import app
+
+    # Move everything loaded so far out of the GC's reach, so collections in the
+    # workers do not write to (and thereby copy) the shared pages
+    gc.collect()
+    gc.freeze()
+
+    options = {
+        'bind': f"{args.host}:{args.port}",
+        'workers': args.workers,
+        'threads': args.threads,
+        'timeout': args.timeout,
+        'preload_app': True,
+    }
+    print(f"🚀 Serving on http://{args.host}:{args.port} with {args.workers} workers")
+    PreloadedApplication(app, options).run()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# Central registry of the keywords used to tie news text to tickers.
+# Each pipeline keeps its own vocabulary (they tag for different purposes),
+# but all of them live here and are compiled into KeywordMatcher automatons.
+
+from keyword_matcher import KeywordMatcher
+
+# merge_news_data.reassign_tickers: most keyword hits wins
+NEWS_TICKER_KEYWORDS = {
+    'TCS': ['TCS', 'Tata Consultancy', 'IT services', 'software'],
+    'HDFCBANK': ['HDFC Bank', 'banking', 'loan', 'deposit'],
+    'BAJFINANCE': ['Bajaj Finance', 'Bajaj', 'NBFC', 'lending'],
+    'ASIANPAINT': ['Asian Paints', 'paint', 'decorative'],
+    'LEMONTREE': ['Lemon Tree', 'hotel', 'hospitality'],
+    'VBL': ['Varun Beverages', 'beverages', 'FMCG']
+}
+
+NEWS_GENERAL_FINANCIAL = [
+    'stock market', 'share price', 'equity', 'investment', 'trading',
+    'earnings', 'profit', 'revenue', 'quarter', 'annual report'
+]
+
+# process_finsen: company mentions used to filter and score FinSen rows
+FINSEN_STOCK_KEYWORDS = {
+    'TCS': ['TCS', 'Tata Consultancy', 'Tata Consultancy Services'],
+    'HDFC': ['HDFC', 'HDFC Bank', 'Housing Development Finance'],
+    'BAJAJ': ['Bajaj', 'Bajaj Finance', 'Bajaj Finserv'],
+    'ASIAN_PAINTS': ['Asian Paints', 'Asian Paint'],
+    'LEMON_TREE': ['Lemon Tree', 'Lemon Tree Hotels'],
+    'VARUN': ['Varun Beverages', 'VBL', 'Varun Bev']
+}
+
+FINSEN_GENERAL_KEYWORDS = [
+    'banking', 'finance', 'IT services', 'software', 'technology',
+    'stock market', 'equity', 'investment', 'trading', 'NSE', 'BSE',
+    'India', 'Indian', 'Mumbai', 'financial services', 'insurance'
+]
+
+FINSEN_FINANCIAL_TERMS = [
+    'stock', 'share', 'market', 'trading', 'investment',
+    'earnings', 'revenue', 'profit', 'loss', 'growth'
+]
+
+# collect_sentiment_flexible: broad search variations per ticker
+SEARCH_TERMS = {
+    'TCS': ['TCS', 'Tata Consultancy', 'Tata Consultancy Services', 'IT services', 'software services'],
+    'HDFCBANK': ['HDFC', 'HDFC Bank', 'housing development finance', 'private bank', 'banking'],
+    'BAJFINANCE': ['Bajaj Finance', 'Bajaj', 'NBFC', 'consumer finance', 'financial services'],
+    'ASIANPAINT': ['Asian Paints', 'Asian Paint', 'paint', 'decorative', 'coatings'],
+    'LEMONTREE': ['Lemon Tree', 'hotel', 'hospitality', 'accommodation', 'tourism'],
+    'VBL': ['Varun Beverages', 'Varun', 'beverages', 'soft drinks', 'pepsi', 'cola']
+}
+
+VOCABULARIES = {
+    'news': NEWS_TICKER_KEYWORDS,
+    'news_general': {'FINANCIAL_GENERAL': NEWS_GENERAL_FINANCIAL},
+    'finsen': FINSEN_STOCK_KEYWORDS,
+    'finsen_general': {'GENERAL_FINANCIAL': FINSEN_GENERAL_KEYWORDS},
+    'finsen_terms': {term: [term] for term in FINSEN_FINANCIAL_TERMS},
+    'search': SEARCH_TERMS,
+}
+
+_matchers = {}
+
+def get_matcher(name):
+    """Compiled matcher for a registry vocabulary, built once per process"""
+    if name not in _matchers:
+        _matchers[name] = KeywordMatcher(VOCABULARIES[name])
+    return _matchers[name]
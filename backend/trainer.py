@@ -1,8 +1,14 @@
-import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
+from contextlib import contextmanager
 import joblib
 import os
 import sys
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock; the server's job store still allows one job at a time
+    fcntl = None
 
 # Add project root to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -10,23 +16,52 @@ project_root = os.path.dirname(current_dir)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from config import DATA_DIR, MODEL_PATH
+from config import MODEL_PATH, FOREST_PATH, TRAINING_LOCK_PATH
+from flat_forest import export_forest, file_sha1
+from feature_store import load_features
+
+
+@contextmanager
+def training_lock(path=TRAINING_LOCK_PATH):
+    """Exclusive lock across processes, so two trainings never overlap or interleave their writes"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
 
+def dump_temp(obj, path):
+    """joblib.dump next to path under a unique temp name; the caller os.replace()s it into place"""
+    # Uncompressed, so arrays are stored aligned and can be memory-mapped
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        joblib.dump(obj, tmp_path, compress=0)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
 
 def train_model():
-    # Build full path
-    data_file = os.path.join(DATA_DIR, 'features_with_events.csv')
-    
-    print(f"Loading data from: {data_file}")
-    df = pd.read_csv(data_file, parse_dates=['date'])
-    print(f"Data loaded. Shape: {df.shape}")
-    
+    # Held for the whole run: a second trainer waits, then trains on fresh data
+    with training_lock():
+        _train_and_save()
+
+def _train_and_save():
     features = [
         'close_price','sentiment_score','usd_inr_rate','interest_rate',
         'unemployment_rate','days_to_next_event','days_since_last_event',
         'is_event_window','event_impact_score'
     ]
     
+    print("Loading data from feature store")
+    df = load_features(features + ['return_direction'])
+    print(f"Data loaded. Shape: {df.shape}")
+    
     X = df[features]
     y = df['return_direction']
     
@@ -44,7 +79,18 @@ def train_model():
     model_dir = os.path.dirname(MODEL_PATH)
     os.makedirs(model_dir, exist_ok=True)
     
-    joblib.dump(rf, MODEL_PATH)
+    # Files are swapped in whole, so a concurrent reload never reads a partial one.
+    # The flat-array export, tagged with the new pickle's hash, goes in first so
+    # processes reloading on the new model file find a matching export.
+    model_tmp = dump_temp(rf, MODEL_PATH)
+    try:
+        forest_tmp = dump_temp(export_forest(rf, model_sha1=file_sha1(model_tmp)), FOREST_PATH)
+        os.replace(forest_tmp, FOREST_PATH)
+        os.replace(model_tmp, MODEL_PATH)
+    except BaseException:
+        if os.path.exists(model_tmp):
+            os.remove(model_tmp)
+        raise
     print(f"✅ Model trained and saved to: {MODEL_PATH}")
 
 
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import sys
+import uuid
+from datetime import datetime
+
+# Add project root to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from config import TRAINING_JOBS_DB
+
+JOB_FIELDS = ['job_id', 'status', 'started_at', 'finished_at', 'model_version', 'error', 'pid']
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    """Training jobs shared by every server process, in one SQLite file.
+
+    Each job records the pid of the worker that started it, so a 'running'
+    job whose worker has exited is known to be dead and no longer blocks
+    new jobs. Connections are opened per call, as callers run on request
+    threads and on executor callback threads.
+    """
+
+    def __init__(self, path=TRAINING_JOBS_DB, max_finished=50):
+        self.path = path
+        self.max_finished = max_finished
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT,
+                    model_version INTEGER,
+                    error TEXT,
+                    pid INTEGER NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        return _Transaction(conn)
+
+    def claim(self):
+        """Start a job for this process unless one is already running anywhere.
+
+        Returns (job_id, created): the new job's id, or the running job's id
+        with created=False.
+        """
+        with self._connect() as conn:
+            for job_id, pid in conn.execute("SELECT job_id, pid FROM jobs WHERE status = 'running'").fetchall():
+                if _pid_alive(pid):
+                    return job_id, False
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE job_id = ?",
+                    (f"server process {pid} exited before the job finished", _now(), job_id)
+                )
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, started_at, pid) VALUES (?, 'running', ?, ?)",
+                (job_id, _now(), os.getpid())
+            )
+            # Forget the oldest finished jobs beyond max_finished
+            conn.execute("""
+                DELETE FROM jobs WHERE job_id IN (
+                    SELECT job_id FROM jobs WHERE status != 'running'
+                    ORDER BY rowid DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_finished,))
+            return job_id, True
+
+    def finish(self, job_id, status, model_version=None, error=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, model_version = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (status, model_version, error, _now(), job_id)
+            )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(JOB_FIELDS, row))
+        del job['pid']
+        return job
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT around a connection, closing it afterwards"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        # Take the write lock up front so check-then-insert in claim() is atomic across processes
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.conn.close()
+        return False
@@ -1,16 +1,20 @@
-import pandas as pd
+import os
+import sys
 import mysql.connector
 from config import DATABASE_CONFIG
 
-# Check CSV dates and content
-print("🔍 CHECKING CSV FILE...")
-df = pd.read_csv('data/financial_news.csv', parse_dates=['Date'])
-print(f'CSV Shape: {df.shape}')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from news_store import load_news
+
+# Check stored news dates and content
+print("🔍 CHECKING NEWS STORE...")
+df = load_news()
+print(f'News shape: {df.shape}')
 print(f'Date range: {df["Date"].min()} to {df["Date"].max()}')
 print('\nSample titles:')
 print(df['Title'].head(5).tolist())
 
-print('\nTicker mentions in CSV:')
+print('\nTicker mentions in news:')
 for ticker in ['TCS', 'HDFC', 'Bajaj', 'Asian', 'Lemon', 'VBL']:
     count = df['Title'].str.contains(ticker, case=False, na=False).sum()
     print(f'{ticker}: {count} mentions')
@@ -7,6 +7,16 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 # Stock symbols
 STOCK_SYMBOLS = ['TCS', 'HDFCBANK', 'BAJFINANCE', 'ASIANPAINT', 'LEMONTREE', 'VBL']
 
+# Company names the news scrapers search for
+COMPANY_NAMES = {
+    'TCS': 'Tata Consultancy Services',
+    'HDFCBANK': 'HDFC Bank',
+    'BAJFINANCE': 'Bajaj Finance',
+    'ASIANPAINT': 'Asian Paints',
+    'LEMONTREE': 'Lemon Tree Hotels',
+    'VBL': 'Varun Beverages'
+}
+
 # Database configuration
 DATABASE_CONFIG = {
     'host': 'localhost',
@@ -18,11 +28,34 @@ DATABASE_CONFIG = {
 # Paths (using absolute paths)
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'rf_model.pkl')
+FOREST_PATH = os.path.join(PROJECT_ROOT, 'models', 'rf_forest.joblib')
+TRAINING_JOBS_DB = os.path.join(PROJECT_ROOT, 'models', 'training_jobs.db')
+TRAINING_LOCK_PATH = os.path.join(PROJECT_ROOT, 'models', 'training.lock')
 NEWS_CSV_PATH = os.path.join(DATA_DIR, 'financial_news.csv')
+NEWS_STORE_DIR = os.path.join(DATA_DIR, 'news_store')
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'http_cache')
+FEATURE_STORE_DIR = os.path.join(DATA_DIR, 'feature_store')
+SENTIMENT_CACHE_PATH = os.path.join(DATA_DIR, 'sentiment_cache.db')
+
+# Serve predictions from the memory-mapped flat-array forest export, shared by
+# all server workers, instead of a private unpickled sklearn forest per process
+USE_FLAT_FOREST = True
+
+# Requests sent with an X-Profile header are run under cProfile and the stats
+# written here; leave False in production unless investigating latency
+PROFILING_ENABLED = False
+PROFILE_DIR = os.path.join(PROJECT_ROOT, 'profiles')
 
 # Debug: Print paths to verify
 if __name__ == "__main__":
     print("Project root:", PROJECT_ROOT)
     print("Data directory:", DATA_DIR)
     print("Model path:", MODEL_PATH)
+    print("Flat forest path:", FOREST_PATH)
+    print("Training jobs DB:", TRAINING_JOBS_DB)
     print("News CSV path:", NEWS_CSV_PATH)
+    print("News store directory:", NEWS_STORE_DIR)
+    print("HTTP cache directory:", HTTP_CACHE_DIR)
+    print("Feature store directory:", FEATURE_STORE_DIR)
+    print("Sentiment cache path:", SENTIMENT_CACHE_PATH)
+    print("Profile directory:", PROFILE_DIR)
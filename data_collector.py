@@ -2,10 +2,41 @@ import yfinance as yf
 import pandas as pd
 import mysql.connector
 from datetime import datetime, timedelta
+import os
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from bulk_loader import iter_db_rows, DEFAULT_BATCH_SIZE
+
+class RateLimiter:
+    """Spaces out calls to at most `rate` per second across threads"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# Extra attempts per ticker after a failed download, with exponential backoff
+DOWNLOAD_RETRIES = 2
+RETRY_DELAY = 2.0
 
 class StockDataCollector:
-    def __init__(self):
+    def __init__(self, provider=None, connection=None, retries=DOWNLOAD_RETRIES, retry_delay=RETRY_DELAY):
+        # Anything with yfinance's Ticker(symbol).history(start=, end=) API
+        self.provider = provider or yf
+        self.retries = retries
+        self.retry_delay = retry_delay
+        
         # Our 6 selected stocks
         self.stocks = {
             'TCS.NS': 'Tata Consultancy Services',
@@ -16,56 +47,83 @@ class StockDataCollector:
             'VBL.NS': 'Varun Beverages'
         }
         
-        # Database connection
-        self.connection = mysql.connector.connect(
+        # Database connection (any DB-API connection can be passed in instead)
+        self.connection = connection or mysql.connector.connect(
             host='localhost',
             user='root',
             password='hmrl1', 
             database='stock_prediction'
         )
     
-    def collect_historical_data(self, start_date='2019-01-01', end_date=None):
-        """Collect 5+ years of historical data for all stocks"""
+    def download_history(self, ticker, start_date, end_date, limiter=None):
+        """Download and clean one ticker's price history, retrying failed requests"""
+        for attempt in range(self.retries + 1):
+            if limiter is not None:
+                limiter.wait()
+            try:
+                # Download data using yfinance
+                stock = self.provider.Ticker(ticker)
+                hist = stock.history(start=start_date, end=end_date)
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.retry_delay * 2 ** attempt
+                print(f"⚠️ {ticker} download failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        
+        if hist.empty:
+            return hist
+        
+        hist.reset_index(inplace=True)
+        hist['ticker'] = ticker.replace('.NS', '')
+        
+        # Clean column names
+        hist.columns = ['date', 'open_price', 'high_price', 'low_price', 
+                      'close_price', 'volume', 'dividends', 'stock_splits', 'ticker']
+        
+        # Select only needed columns
+        return hist[['ticker', 'date', 'open_price', 'high_price', 
+                   'low_price', 'close_price', 'volume']]
+    
+    def collect_historical_data(self, start_date='2019-01-01', end_date=None,
+                                max_workers=4, requests_per_second=1.0, batch_size=DEFAULT_BATCH_SIZE):
+        """Collect 5+ years of historical data for all stocks.
+        
+        Downloads run on a thread pool behind a shared rate limiter, and each
+        finished frame is inserted on this thread (the DB connection is not
+        shared) while the remaining downloads continue.
+        """
         
         if end_date is None:
             end_date = datetime.now().strftime('%Y-%m-%d')
         
         print(f"📈 Collecting stock data from {start_date} to {end_date}")
         
-        for ticker, name in self.stocks.items():
-            print(f"\n🔄 Downloading {name} ({ticker})...")
+        limiter = RateLimiter(requests_per_second)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(self.download_history, ticker, start_date, end_date, limiter): (ticker, name)
+                for ticker, name in self.stocks.items()
+            }
             
-            try:
-                # Download data using yfinance
-                stock = yf.Ticker(ticker)
-                hist = stock.history(start=start_date, end=end_date)
-                
-                if hist.empty:
-                    print(f"❌ No data found for {ticker}")
-                    continue
-                
-                
-                hist.reset_index(inplace=True)
-                hist['ticker'] = ticker.replace('.NS', '')
-                
-                # Clean column names
-                hist.columns = ['date', 'open_price', 'high_price', 'low_price', 
-                              'close_price', 'volume', 'dividends', 'stock_splits', 'ticker']
-                
-                # Select only needed columns
-                hist = hist[['ticker', 'date', 'open_price', 'high_price', 
-                           'low_price', 'close_price', 'volume']]
-                
-                
-                self.insert_stock_data(hist)
-                
-                print(f"✅ {name}: {len(hist)} records inserted")
-                time.sleep(1)  
-                
-            except Exception as e:
-                print(f"❌ Error downloading {ticker}: {e}")
+            for future in as_completed(futures):
+                ticker, name = futures[future]
+                try:
+                    hist = future.result()
+                    
+                    if hist.empty:
+                        print(f"❌ No data found for {ticker}")
+                        continue
+                    
+                    self.insert_stock_data(hist, batch_size)
+                    
+                    print(f"✅ {name}: {len(hist)} records inserted")
+                    
+                except Exception as e:
+                    print(f"❌ Error downloading {ticker}: {e}")
     
-    def insert_stock_data(self, df):
+    def insert_stock_data(self, df, batch_size=DEFAULT_BATCH_SIZE):
         """Insert stock data into database"""
         cursor = self.connection.cursor()
         
@@ -73,25 +131,22 @@ class StockDataCollector:
         INSERT IGNORE INTO stocks (ticker, date, open_price, high_price, low_price, close_price, volume)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        
-        # Convert DataFrame to list of tuples
-        data = []
-        for _, row in df.iterrows():
-            data.append((
-                row['ticker'],
-                row['date'].strftime('%Y-%m-%d'),
-                float(row['open_price']),
-                float(row['high_price']),
-                float(row['low_price']),
-                float(row['close_price']),
-                int(row['volume'])
-            ))
+        columns = ['ticker', 'date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume']
         
         try:
-            cursor.executemany(insert_query, data)
-            self.connection.commit()
+            # Cast whole columns once instead of converting every cell; a missing
+            # volume (nullable Int64) is stored as NULL instead of failing the ticker
+            df = df.astype({
+                'open_price': 'float64', 'high_price': 'float64',
+                'low_price': 'float64', 'close_price': 'float64', 'volume': 'Int64'
+            })
+            
+            # One executemany and commit per chunk keeps large backfills bounded in memory
+            for rows in iter_db_rows(df, columns, batch_size):
+                cursor.executemany(insert_query, rows)
+                self.connection.commit()
         except Exception as e:
-            print(f"❌ Database error: {e}")
+            print(f"❌ Error inserting {len(df)} rows: {e}")
         finally:
             cursor.close()
     
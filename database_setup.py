@@ -1,7 +1,13 @@
+import os
+import sys
 import mysql.connector
 from mysql.connector import Error
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from bulk_loader import ensure_columns
+from sentiment_scoring import SENTIMENT_STAT_COLUMNS
+
 class DatabaseManager:
     def __init__(self):
         self.connection = None
@@ -90,6 +96,8 @@ class DatabaseManager:
             sentiment_score DECIMAL(5,4),
             tweet_count INT,
             news_count INT,
+            min_score DECIMAL(5,4),
+            max_score DECIMAL(5,4),
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             UNIQUE KEY unique_sentiment_date (ticker, date)
         )
@@ -126,7 +134,9 @@ class DatabaseManager:
             print("✅ Created 'stocks' table")
             
             cursor.execute(sentiment_table)
-            print("✅ Created 'sentiment_data' table")
+            # Tables created before min/max were tracked need the columns added
+            added = ensure_columns(self.connection, 'sentiment_data', SENTIMENT_STAT_COLUMNS)
+            print("✅ Created 'sentiment_data' table" + (f" (added {', '.join(added)})" if added else ""))
             
             cursor.execute(macro_table)
             print("✅ Created 'macro_indicators' table")
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import warnings
+import numpy as np
+
+# Add project root and backend to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
+
+from predictor import StockPredictor
+from flat_forest import FlatForest
+
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+def time_calls(fn, rows, repeat):
+    samples = []
+    for i in range(repeat):
+        x = rows[i % len(rows)]
+        start = time.perf_counter()
+        fn(x)
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.array(samples)
+
+def run_benchmark(repeat=200):
+    predictor = StockPredictor(use_flat_forest=False)
+    model = predictor.model
+    forest = FlatForest.from_model(model)
+
+    # Both engines must agree on the whole feature table before their timings mean anything
+    X = predictor.data[predictor.features].to_numpy(dtype=np.float64)
+    max_diff = np.abs(forest.predict_proba(X) - model.predict_proba(X)).max()
+    assert max_diff < 1e-9, f"flat forest diverges from sklearn by {max_diff}"
+    print(f"✅ predict_proba matches sklearn on {len(X)} rows (max abs diff {max_diff:.2e})")
+
+    rows = [predictor.get_latest_features(t) for t in predictor.index]
+    results = {
+        'sklearn predict_proba': time_calls(model.predict_proba, rows, repeat),
+        'flat forest': time_calls(forest.predict_proba, rows, repeat),
+    }
+
+    print(f"\n⏱ Single-row inference over {repeat} calls (ms)")
+    print("-" * 60)
+    for name, samples in results.items():
+        print(f"{name:<26} | p50 {np.percentile(samples, 50):7.3f} | p99 {np.percentile(samples, 99):7.3f}")
+
+    before = np.median(results['sklearn predict_proba'])
+    after = np.median(results['flat forest'])
+    print(f"\n✅ Speedup: {before / after:.2f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
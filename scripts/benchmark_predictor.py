@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import warnings
+import numpy as np
+
+# Add project root and backend to Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
+
+from config import STOCK_SYMBOLS
+from predictor import StockPredictor
+
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+def two_pass_predict(predictor, ticker):
+    """Previous request path: predict() followed by predict_proba()"""
+    X = predictor.get_latest_features(ticker)
+    pred = int(predictor.model.predict(X)[0])
+    conf = float(predictor.model.predict_proba(X)[0][pred])
+    return pred, conf
+
+def time_calls(fn, repeat):
+    samples = []
+    for i in range(repeat):
+        ticker = STOCK_SYMBOLS[i % len(STOCK_SYMBOLS)]
+        start = time.perf_counter()
+        fn(ticker)
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.array(samples)
+
+def run_benchmark(repeat=200):
+    # Both paths go through the sklearn forest, whatever engine the server uses
+    predictor = StockPredictor(use_flat_forest=False)
+
+    # Both paths must agree before their timings mean anything
+    for ticker in STOCK_SYMBOLS:
+        assert two_pass_predict(predictor, ticker) == predictor.predict(ticker)
+
+    results = {
+        'predict + predict_proba': time_calls(lambda t: two_pass_predict(predictor, t), repeat),
+        'single predict_proba': time_calls(predictor.predict, repeat),
+    }
+
+    print(f"⏱ /predict latency over {repeat} calls (ms)")
+    print("-" * 60)
+    for name, samples in results.items():
+        print(f"{name:<26} | p50 {np.percentile(samples, 50):7.3f} | p99 {np.percentile(samples, 99):7.3f}")
+
+    before = np.median(results['predict + predict_proba'])
+    after = np.median(results['single predict_proba'])
+    print(f"\n✅ Speedup: {before / after:.2f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
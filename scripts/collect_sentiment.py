@@ -1,7 +1,9 @@
 # scripts/collect_sentiment.py
 
+import argparse
 import os
 import sys
+import time
 import pandas as pd
 import mysql.connector
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
@@ -15,25 +17,39 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from config import STOCK_SYMBOLS, DATABASE_CONFIG, NEWS_CSV_PATH
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
+
+from config import STOCK_SYMBOLS, DATABASE_CONFIG
+from news_store import load_news
+from sentiment_cache import SentimentCache
+from sentiment_scoring import aggregate_daily
+from bulk_loader import BufferedWriter, DEFAULT_BATCH_SIZE
 
 class SentimentCollectorFree:
-    def __init__(self):
+    def __init__(self, workers=1, batch_size=DEFAULT_BATCH_SIZE):
         self.db = mysql.connector.connect(**DATABASE_CONFIG)
         self.cur = self.db.cursor()
         self.table_name = 'sentiment_data'
+        self.batch_size = batch_size
         self.analyzer = SentimentIntensityAnalyzer()
+        self.scores = SentimentCache(self.analyzer, workers=workers)
 
     def setup_table(self):
         # Drop old table then create fresh with correct schema
         self.cur.execute(f"DROP TABLE IF EXISTS {self.table_name};")
+        # One row per (ticker, date); headlines are aggregated before insert
         create_sql = f"""
         CREATE TABLE {self.table_name} (
             id INT AUTO_INCREMENT PRIMARY KEY,
-            Date DATE,
-            Ticker VARCHAR(50),
-            SentimentScore FLOAT,
-            Headline TEXT
+            ticker VARCHAR(20) NOT NULL,
+            date DATE NOT NULL,
+            sentiment_score DECIMAL(5,4),
+            tweet_count INT,
+            news_count INT,
+            min_score DECIMAL(5,4),
+            max_score DECIMAL(5,4),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY unique_sentiment_date (ticker, date)
         ) ENGINE=InnoDB;
         """
         self.cur.execute(create_sql)
@@ -45,32 +61,43 @@ class SentimentCollectorFree:
         self.db.commit()
 
     def collect(self):
-        # Load and parse dates
-        df = pd.read_csv(NEWS_CSV_PATH)
+        # Merged headlines live in the news store (legacy CSV until it is created)
+        df = load_news()
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
         df = df.dropna(subset=['Date'])
+        df = df[df['Ticker'].isin(STOCK_SYMBOLS)].copy()
         
-        for ticker in STOCK_SYMBOLS:
-            subset = df[df['Ticker'] == ticker]
-            for _, row in subset.iterrows():
-                date = row['Date'].date()
-                title = str(row['Title'])
-                score = self.analyzer.polarity_scores(title)['compound']
-                
-                insert_sql = f"""
-                INSERT INTO {self.table_name} 
-                  (Date, Ticker, SentimentScore, Headline)
-                VALUES (%s, %s, %s, %s);
-                """
-                self.cur.execute(insert_sql, (date, ticker, score, title))
-        self.db.commit()
+        # Score every headline up front so the worker pool sees one large batch
+        start = time.perf_counter()
+        df['score'] = self.scores.compound_many(df['Title'].astype(str))
+        elapsed = time.perf_counter() - start
+        print(f"Scored {len(df)} headlines ({self.scores.misses} new) with {self.scores.workers} worker(s) "
+              f"at {len(df) / max(elapsed, 1e-9):.0f} headlines/sec")
+        
+        # One (ticker, date) row with mean/count/min/max instead of one row per headline
+        daily = aggregate_daily(df, 'Ticker', 'Date', 'score')
+        insert_sql = f"""
+        INSERT INTO {self.table_name} 
+          (ticker, date, sentiment_score, tweet_count, news_count, min_score, max_score)
+        VALUES (%s, %s, %s, 0, %s, %s, %s);
+        """
+        with BufferedWriter(self.db, insert_sql, self.batch_size) as writer:
+            writer.add_frame(daily, ['ticker', 'date', 'sentiment_score', 'news_count', 'min_score', 'max_score'])
+        print(f"Aggregated {len(df)} headlines into {len(daily)} daily sentiment rows")
 
     def close(self):
+        self.scores.close()
         self.cur.close()
         self.db.close()
 
 if __name__ == '__main__':
-    sc = SentimentCollectorFree()
+    parser = argparse.ArgumentParser(description="Score news headlines into sentiment_data")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="processes used for VADER scoring")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per executemany/commit")
+    args = parser.parse_args()
+    sc = SentimentCollectorFree(workers=args.workers, batch_size=args.batch_size)
     sc.setup_table()
     print("🗑️  sentiment_data table dropped and recreated")
     sc.truncate_table()
@@ -3,10 +3,16 @@ root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, root_dir)  # Force local imports first
 
 import mysql.connector
-import pandas as pd
-from datetime import datetime
 import numpy as np
 
+sys.path.insert(0, os.path.join(root_dir, 'backend'))
+from sentiment_cache import SentimentCache
+from bulk_loader import BufferedWriter, DEFAULT_BATCH_SIZE, ensure_columns
+from sentiment_scoring import SENTIMENT_STAT_COLUMNS
+from keyword_matcher import KeywordMatcher
+from ticker_keywords import SEARCH_TERMS, get_matcher
+from news_store import load_news
+
 # Import NLTK and download VADER if needed
 try:
     from nltk.sentiment.vader import SentimentIntensityAnalyzer
@@ -33,21 +39,46 @@ STOCK_SYMBOLS = {
 }
 
 class FlexibleSentimentCollector:
-    def __init__(self):
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
         self.db = mysql.connector.connect(**DATABASE_CONFIG)
+        # Keep an existing table's schema in step with the other sentiment writers
+        ensure_columns(self.db, 'sentiment_data', SENTIMENT_STAT_COLUMNS)
+        # Rows are buffered and written with one executemany + commit per chunk
+        self.writer = BufferedWriter(
+            self.db,
+            "INSERT IGNORE INTO sentiment_data (ticker, date, sentiment_score, tweet_count, news_count) "
+            "VALUES (%s, %s, %s, 0, %s)",
+            batch_size
+        )
         self.sia = SentimentIntensityAnalyzer()
+        # Overlapping ±3 day windows see the same headline up to 7 times per ticker
+        self.scores = SentimentCache(self.sia)
         
-        # Load news CSV
-        csv_path = os.path.join(root_dir, 'data/financial_news.csv')
-        self.news_df = pd.read_csv(csv_path, parse_dates=['Date'])
-        self.news_df['Date'] = pd.to_datetime(self.news_df['Date'], errors='coerce')
+        # Load news (store partitions, or the legacy CSV before the store exists)
+        self.news_df = load_news(csv_path=os.path.join(root_dir, 'data/financial_news.csv'))
         self.news_df.dropna(subset=['Date'], inplace=True)
+        # Sort once so each ±3 day window is a contiguous slice found by binary search
+        self.news_df = self.news_df.sort_values('Date', kind='mergesort').reset_index(drop=True)
+        self.news_days = self.news_df['Date'].dt.date.to_numpy().astype('datetime64[D]')
         print(f"📰 Loaded {len(self.news_df)} headlines from CSV")
         
         # Find headline column
         headline_cols = [c for c in self.news_df.columns if 'title' in c.lower() or 'headline' in c.lower()]
         self.headline_col = headline_cols[0] if headline_cols else 'Title'
         print(f"✅ Using '{self.headline_col}' column for headlines")
+        
+        # Tag every headline once; each ±3 day window is then a slice of these masks
+        self.search_matcher = get_matcher('search')
+        self.ticker_masks = self.tag_headlines(self.search_matcher)
+
+    def tag_headlines(self, matcher):
+        """Boolean mask per matcher label marking the headlines that mention it"""
+        masks = {label: np.zeros(len(self.news_df), dtype=bool) for label in matcher.groups}
+        for i, headline in enumerate(self.news_df[self.headline_col]):
+            if isinstance(headline, str):
+                for label in matcher.counts(headline):
+                    masks[label][i] = True
+        return masks
 
     def get_stock_dates(self, ticker):
         """Get all dates for a ticker from stocks table"""
@@ -60,36 +91,26 @@ class FlexibleSentimentCollector:
 
     def get_flexible_search_terms(self, ticker):
         """Create multiple search variations for each ticker"""
-        search_terms = {
-            'TCS': ['TCS', 'Tata Consultancy', 'Tata Consultancy Services', 'IT services', 'software services'],
-            'HDFCBANK': ['HDFC', 'HDFC Bank', 'housing development finance', 'private bank', 'banking'],
-            'BAJFINANCE': ['Bajaj Finance', 'Bajaj', 'NBFC', 'consumer finance', 'financial services'],
-            'ASIANPAINT': ['Asian Paints', 'Asian Paint', 'paint', 'decorative', 'coatings'],
-            'LEMONTREE': ['Lemon Tree', 'hotel', 'hospitality', 'accommodation', 'tourism'],
-            'VBL': ['Varun Beverages', 'Varun', 'beverages', 'soft drinks', 'pepsi', 'cola']
-        }
-        
-        return search_terms.get(ticker, [ticker])
+        return SEARCH_TERMS.get(ticker, [ticker])
 
     def collect_sentiment_for_date(self, ticker, date):
         """Collect sentiment for a specific ticker and date using flexible matching"""
-        search_terms = self.get_flexible_search_terms(ticker)
+        if ticker not in self.ticker_masks:
+            terms = self.get_flexible_search_terms(ticker)
+            self.ticker_masks.update(self.tag_headlines(KeywordMatcher({ticker: terms})))
         
         # Filter news by date (±3 days window for more coverage)
-        date_start = date - pd.Timedelta(days=3)
-        date_end = date + pd.Timedelta(days=3)
-        
-        date_mask = (self.news_df['Date'].dt.date >= date_start) & (self.news_df['Date'].dt.date <= date_end)
-        period_news = self.news_df.loc[date_mask]
+        day = np.datetime64(date, 'D')
+        start = np.searchsorted(self.news_days, day - np.timedelta64(3, 'D'), side='left')
+        end = np.searchsorted(self.news_days, day + np.timedelta64(3, 'D'), side='right')
+        period_news = self.news_df.iloc[start:end]
         
         if period_news.empty:
             return None, 0
         
-        # Find relevant headlines using multiple search terms
-        relevant_headlines = []
-        for term in search_terms:
-            mask = period_news[self.headline_col].str.contains(term, case=False, na=False)
-            relevant_headlines.extend(period_news.loc[mask, self.headline_col].tolist())
+        # Headlines matching any of the ticker's search terms (tagged up front)
+        mask = self.ticker_masks[ticker][start:end]
+        relevant_headlines = period_news.loc[mask, self.headline_col].tolist()
         
         # Remove duplicates
         relevant_headlines = list(set(relevant_headlines))
@@ -98,27 +119,20 @@ class FlexibleSentimentCollector:
             # If no specific matches, use general financial sentiment for the period
             general_headlines = period_news[self.headline_col].tolist()[:10]  # Take up to 10 general headlines
             if general_headlines:
-                scores = [self.sia.polarity_scores(headline)['compound'] for headline in general_headlines]
+                scores = self.scores.compound_many(general_headlines)
                 avg_score = np.mean(scores) * 0.5  # Reduce weight for general sentiment
                 return avg_score, len(general_headlines)
             return None, 0
         
         # Calculate sentiment scores
-        scores = [self.sia.polarity_scores(headline)['compound'] for headline in relevant_headlines]
+        scores = self.scores.compound_many(relevant_headlines)
         avg_score = np.mean(scores)
         
         return avg_score, len(relevant_headlines)
 
     def insert_sentiment(self, ticker, date, score, count):
-        """Insert sentiment data into database"""
-        cursor = self.db.cursor()
-        cursor.execute(
-            "INSERT IGNORE INTO sentiment_data (ticker, date, sentiment_score, tweet_count, news_count) "
-            "VALUES (%s, %s, %s, 0, %s)",
-            (ticker, date, score, count)
-        )
-        self.db.commit()
-        cursor.close()
+        """Queue sentiment data for the next batched insert"""
+        self.writer.add((ticker, date, float(score), int(count)))
 
     def run(self):
         """Process sentiment for all tickers and dates"""
@@ -145,7 +159,10 @@ class FlexibleSentimentCollector:
             
             print(f"✅ {ticker}: {inserted_count} sentiment records inserted")
         
+        self.writer.close()
         print(f"\n🎉 Total sentiment records inserted: {total_inserted}")
+        print(f"   Sentiment cache: {self.scores.hits} hits, {self.scores.misses} headlines scored")
+        self.scores.close()
         self.db.close()
 
 if __name__ == "__main__":
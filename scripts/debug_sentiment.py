@@ -1,10 +1,16 @@
+import os
+import sys
 import pandas as pd
-import numpy as np
 from datetime import datetime
 
-# Load and check the CSV
-csv_path = 'data/financial_news.csv'
-news_df = pd.read_csv(csv_path)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
+
+from news_store import load_news
+
+# Load and check the stored news
+news_df = load_news()
 news_df['Date'] = pd.to_datetime(news_df['Date'], errors='coerce')
 news_df.dropna(subset=['Date'], inplace=True)
 
@@ -12,7 +18,7 @@ print("🔍 DEBUGGING SENTIMENT DATA MISMATCH...\n")
 
 # 1. Check date ranges
 print("📅 DATE ANALYSIS:")
-print(f"News CSV date range: {news_df['Date'].min()} to {news_df['Date'].max()}")
+print(f"News date range: {news_df['Date'].min()} to {news_df['Date'].max()}")
 print(f"Total headlines: {len(news_df)}")
 
 # 2. Check sample headlines
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+
+DEFAULT_CONCURRENCY = '1,4,16,64'
+
+async def run_level(session, url, total, concurrency):
+    """Issue `total` GETs with `concurrency` in flight; return per-request latencies (ms) and wall time"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                async with session.get(url) as resp:
+                    await resp.read()
+                    if resp.status != 200:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start, errors
+
+async def run_load_test(base_url, ticker, total, levels):
+    url = f"{base_url.rstrip('/')}/predict/{ticker}"
+    connector = aiohttp.TCPConnector(limit=max(levels))
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Warm up connections and worker caches before measuring
+        await run_level(session, url, min(total, 20), min(max(levels), 4))
+
+        print(f"⏱ GET {url}, {total} requests per level")
+        print("-" * 72)
+        print(f"{'concurrency':>11} | {'p50 ms':>8} | {'p99 ms':>8} | {'req/s':>9} | errors")
+        for concurrency in levels:
+            latencies, elapsed, errors = await run_level(session, url, total, concurrency)
+            print(f"{concurrency:>11} | {np.percentile(latencies, 50):8.2f} | "
+                  f"{np.percentile(latencies, 99):8.2f} | {total / elapsed:9.1f} | {errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /predict latency at increasing concurrency")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the running API")
+    parser.add_argument('--ticker', default='TCS')
+    parser.add_argument('--requests', type=int, default=1000, help="Requests per concurrency level")
+    parser.add_argument('--concurrency', default=DEFAULT_CONCURRENCY,
+                        help=f"Comma-separated in-flight request counts (default: {DEFAULT_CONCURRENCY})")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    asyncio.run(run_load_test(args.url, args.ticker, args.requests, levels))
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 import pandas as pd
@@ -7,43 +8,31 @@ import mysql.connector
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
 from config import DATABASE_CONFIG
+from bulk_loader import bulk_upsert, DEFAULT_BATCH_SIZE
 
-def update_macro_table():
+def update_macro_table(batch_size=DEFAULT_BATCH_SIZE):
     """Update macro_indicators table with unemployment data"""
     
     # Load merged macro data
     macro = pd.read_csv('data/macro_all_clean.csv', parse_dates=['date'])
     
     conn = mysql.connector.connect(**DATABASE_CONFIG)
-    cur = conn.cursor()
-    
-    # Update existing records with unemployment rate
-    sql = """
-    INSERT INTO macro_indicators (date, usd_inr_rate, interest_rate, unemployment_rate)
-    VALUES (%s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-      usd_inr_rate=VALUES(usd_inr_rate),
-      interest_rate=VALUES(interest_rate),
-      unemployment_rate=VALUES(unemployment_rate)
-    """
     
     print(f"Updating {len(macro)} records in macro_indicators table...")
     
-    for _, r in macro.iterrows():
-        cur.execute(
-            sql,
-            (r['date'].date(),
-             float(r['usd_inr_rate']) if pd.notna(r['usd_inr_rate']) else None,
-             float(r['interest_rate']) if pd.notna(r['interest_rate']) else None,
-             float(r['unemployment_rate']) if pd.notna(r['unemployment_rate']) else None)
-        )
+    # Update existing records with unemployment rate
+    bulk_upsert(conn, 'macro_indicators', macro,
+                ['date', 'usd_inr_rate', 'interest_rate', 'unemployment_rate'],
+                batch_size=batch_size)
     
-    conn.commit()
-    cur.close()
     conn.close()
     
     print("✅ Database updated successfully!")
 
 if __name__ == "__main__":
-    update_macro_table()
+    parser = argparse.ArgumentParser(description="Load unemployment data into macro_indicators")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    update_macro_table(args.batch_size)
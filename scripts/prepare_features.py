@@ -1,5 +1,6 @@
 # scripts/prepare_features.py
 
+import argparse
 import os
 import sys
 import mysql.connector
@@ -9,64 +10,155 @@ import pandas as pd
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
 
-from config import DATABASE_CONFIG  # NEWS_CSV_PATH and STOCK_SYMBOLS not needed here
-
-# 1. Read all data from database
-conn = mysql.connector.connect(**DATABASE_CONFIG)
-
-stocks = pd.read_sql(
-    "SELECT date, ticker, close_price FROM stocks", 
-    conn, parse_dates=['date']
-)
-sentiment = pd.read_sql(
-    "SELECT Date AS date, Ticker AS ticker, SentimentScore AS sentiment_score FROM sentiment_data", 
-    conn, parse_dates=['date']
-)
-macro = pd.read_sql(
-    "SELECT date, usd_inr_rate, interest_rate, unemployment_rate FROM macro_indicators", 
-    conn, parse_dates=['date']
-)
-events = pd.read_sql(
-    "SELECT event_type, impact_window_start, impact_window_end FROM market_events", 
-    conn, parse_dates=['impact_window_start','impact_window_end']
-)
-conn.close()
-
-# 2. Merge on ticker and date
-df = stocks.merge(sentiment[['date', 'sentiment_score']], on='date', how='left')
-df = df.merge(macro, on='date', how='left')
-
-# 3. Encode event flags
-for evt in events['event_type'].unique():
-    flag_col = f"{evt.lower()}_flag"
-    df[flag_col] = 0
-    evt_dates = events[events['event_type']==evt]
-    for _, row in evt_dates.iterrows():
-        mask = (df['date']>=row['impact_window_start']) & (df['date']<=row['impact_window_end'])
-        df.loc[mask, flag_col] = 1
-
-# 4. Add lagged returns and target
-df['return_1'] = df.groupby('ticker')['close_price'].pct_change(1)
-df['return_direction'] = (df['return_1'].shift(-1) > 0).astype(int)
-
-# 5. Fill missing values
-# Neutral sentiment for missing
-df['sentiment_score'] = df['sentiment_score'].fillna(0.0)
-# Forward/backward fill macro indicators
-df[['usd_inr_rate','interest_rate','unemployment_rate']] = df[
-    ['usd_inr_rate','interest_rate','unemployment_rate']
-].ffill().bfill()
-
-# Drop only rows missing the target
-df = df.dropna(subset=['return_direction']).reset_index(drop=True)
-
-# Diagnostic output
-print("Merged shape after cleaning:", df.shape)
-print(df.isna().sum())
-
-# 6. Save for modeling
-os.makedirs('data', exist_ok=True)
-output_path = os.path.join('data','features.csv')
-df.to_csv(output_path, index=False)
-print(f"✅ Merged feature file saved at {output_path}")
+from config import DATABASE_CONFIG, DATA_DIR  # NEWS_CSV_PATH and STOCK_SYMBOLS not needed here
+from event_features import encode_event_flags, create_event_features
+from feature_store import write_table, upsert_table, read_metadata, high_water_marks
+
+FEATURE_TABLE = 'features_with_events'
+EVENT_COLS = ['days_to_next_event', 'days_since_last_event', 'is_event_window', 'event_impact_score']
+# Calendar days re-read before each ticker's high-water mark so pct_change
+# has the previous close and macro ffill has a value to carry over holidays
+LOOKBACK_DAYS = 14
+# sentiment_data ticker of the market-wide FinSen rows (update_recent_sentiment.py)
+MARKET_TICKER = 'GENERAL_FINANCIAL'
+
+def load_tables(conn, since=None, known_tickers=()):
+    """Read the source tables, optionally only rows on or after `since`.
+
+    Tickers not in known_tickers are always read in full, since they have
+    no history in the feature store yet.
+    """
+    stock_query, params = "SELECT date, ticker, close_price FROM stocks", ()
+    if since is not None:
+        stock_query += " WHERE date >= %s"
+        params = (since.strftime('%Y-%m-%d'),)
+        if known_tickers:
+            stock_query += f" OR ticker NOT IN ({', '.join(['%s'] * len(known_tickers))})"
+            params += tuple(known_tickers)
+    stocks = pd.read_sql(stock_query + " ORDER BY ticker, date", conn, params=params, parse_dates=['date'])
+
+    # Sentiment and macro only need to cover the oldest stock row we read
+    date_filter, date_params = "", ()
+    if since is not None and len(stocks):
+        date_filter = " WHERE {} >= %s"
+        date_params = (stocks['date'].min().strftime('%Y-%m-%d'),)
+
+    sentiment = pd.read_sql(
+        "SELECT date, ticker, sentiment_score, news_count FROM sentiment_data"
+        + date_filter.format('date'),
+        conn, params=date_params, parse_dates=['date']
+    )
+    macro = pd.read_sql(
+        "SELECT date, usd_inr_rate, interest_rate, unemployment_rate FROM macro_indicators"
+        + date_filter.format('date'),
+        conn, params=date_params, parse_dates=['date']
+    )
+    events = pd.read_sql(
+        "SELECT event_type, impact_window_start, impact_window_end FROM market_events",
+        conn, parse_dates=['impact_window_start','impact_window_end']
+    )
+    return stocks, sentiment, macro, events
+
+def build_features(stocks, sentiment, macro, events):
+    # 2. Merge on ticker and date. sentiment_data holds one row per (ticker, date),
+    # so the join is 1:1; days without ticker-specific news fall back to the
+    # headline-weighted mean of that date's market-wide rows. Other tickers'
+    # company news is left out of the fallback.
+    sentiment = sentiment.astype({'sentiment_score': 'float64', 'news_count': 'float64'})
+    general = sentiment[sentiment['ticker'] == MARKET_TICKER]
+    market = (general.assign(weighted=general['sentiment_score'] * general['news_count'])
+                     .groupby('date')[['weighted', 'news_count']].sum())
+    market = (market['weighted'] / market['news_count'].where(market['news_count'] > 0)).rename('market_sentiment')
+    df = stocks.merge(sentiment[['date', 'ticker', 'sentiment_score']], on=['ticker', 'date'], how='left')
+    df = df.merge(market.reset_index(), on='date', how='left')
+    df['sentiment_score'] = df['sentiment_score'].fillna(df.pop('market_sentiment'))
+    df = df.merge(macro, on='date', how='left')
+
+    # 3. Encode event flags (one searchsorted pass per event type)
+    flags = encode_event_flags(df['date'], events)
+    df[flags.columns] = flags
+
+    # 4. Add lagged returns and target
+    df['return_1'] = df.groupby('ticker')['close_price'].pct_change(1)
+    df['return_direction'] = (df['return_1'].shift(-1) > 0).astype(int)
+
+    # 5. Fill missing values
+    # Neutral sentiment for missing
+    df['sentiment_score'] = df['sentiment_score'].fillna(0.0)
+    # Forward/backward fill macro indicators
+    df[['usd_inr_rate','interest_rate','unemployment_rate']] = df[
+        ['usd_inr_rate','interest_rate','unemployment_rate']
+    ].ffill().bfill()
+
+    # Drop only rows missing the target
+    return df.dropna(subset=['return_direction']).reset_index(drop=True)
+
+def add_event_features(df):
+    # 7. Add event timing features (impact levels live in market_events.csv)
+    event_list = pd.read_csv(os.path.join(DATA_DIR, 'market_events.csv'), parse_dates=['date'])
+    unique_dates = pd.Series(df['date'].drop_duplicates().sort_values().to_numpy())
+    event_features = create_event_features(unique_dates, event_list, window_days=7)
+    return df.merge(event_features[['date'] + EVENT_COLS], on='date', how='left')
+
+def run_full(conn):
+    # 1. Read all data from database
+    df = build_features(*load_tables(conn))
+
+    # Diagnostic output
+    print("Merged shape after cleaning:", df.shape)
+    print(df.isna().sum())
+
+    # 6. Save for modeling
+    os.makedirs('data', exist_ok=True)
+    output_path = os.path.join('data','features.csv')
+    df.to_csv(output_path, index=False)
+    print(f"✅ Merged feature file saved at {output_path}")
+
+    df_full = add_event_features(df)
+    output_path = os.path.join('data', 'features_with_events.csv')
+    df_full.to_csv(output_path, index=False)
+    print(f"✅ Feature file with events saved at {output_path}")
+
+    write_table(df_full, FEATURE_TABLE, metadata={'high_water': high_water_marks(df_full)})
+    print("✅ Feature store rebuilt")
+
+def run_incremental(conn):
+    marks = read_metadata(FEATURE_TABLE).get('high_water')
+    if not marks:
+        print("No high-water marks in the feature store; running a full build")
+        run_full(conn)
+        return
+
+    marks = {ticker: pd.Timestamp(d) for ticker, d in marks.items()}
+    since = min(marks.values()) - pd.Timedelta(days=LOOKBACK_DAYS)
+    df = add_event_features(build_features(*load_tables(conn, since, list(marks))))
+
+    # Keep each ticker's rows from its high-water mark on. The mark row itself
+    # is rewritten because its next-day target is only known now.
+    start = df['ticker'].map(marks).fillna(pd.Timestamp.min)
+    new_rows = df[df['date'] >= start].reset_index(drop=True)
+    if new_rows.empty:
+        print("✅ Feature store already up to date")
+        return
+
+    marks.update({t: d for t, d in new_rows.groupby('ticker')['date'].max().items()})
+    upsert_table(new_rows, FEATURE_TABLE,
+                 metadata={'high_water': {t: str(d.date()) for t, d in marks.items()}})
+    print(f"✅ Appended {len(new_rows)} rows to the feature store")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build model features from the database")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only recompute rows after each ticker's last stored date")
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**DATABASE_CONFIG)
+    try:
+        if args.incremental:
+            run_incremental(conn)
+        else:
+            run_full(conn)
+    finally:
+        conn.close()
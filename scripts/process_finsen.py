@@ -1,27 +1,27 @@
 import pandas as pd
+import numpy as np
 import os
-from datetime import datetime
+import sys
 
-def process_finsen_data():
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
+from ticker_keywords import get_matcher, FINSEN_FINANCIAL_TERMS
+
+# Rows per read_csv chunk; peak memory of the scan is bounded by this
+DEFAULT_CHUNK_SIZE = 20000
+
+def process_finsen_data(chunk_size=DEFAULT_CHUNK_SIZE):
     """
-    Process all 4 FinSen CSV files and extract relevant financial headlines
+    Process all 4 FinSen CSV files and extract relevant financial headlines.
+    Files are streamed in chunks and each chunk is filtered and scored with
+    vectorized column operations.
     """
     finsen_folder = os.path.join(os.path.dirname(__file__), '..', 'data')  # Update with your actual folder path
     
-    # Define your target stocks and related keywords
-    indian_stocks = {
-        'TCS': ['TCS', 'Tata Consultancy', 'Tata Consultancy Services'],
-        'HDFC': ['HDFC', 'HDFC Bank', 'Housing Development Finance'],
-        'BAJAJ': ['Bajaj', 'Bajaj Finance', 'Bajaj Finserv'],
-        'ASIAN_PAINTS': ['Asian Paints', 'Asian Paint'],
-        'LEMON_TREE': ['Lemon Tree', 'Lemon Tree Hotels'],
-        'VARUN': ['Varun Beverages', 'VBL', 'Varun Bev']
-    }
-    
-    # General financial keywords
-    general_keywords = ['banking', 'finance', 'IT services', 'software', 'technology',
-                       'stock market', 'equity', 'investment', 'trading', 'NSE', 'BSE',
-                       'India', 'Indian', 'Mumbai', 'financial services', 'insurance']
+    # Target stocks and general financial keywords (backend/ticker_keywords.py),
+    # compiled once and applied column-wise to each chunk
+    stock_matcher = get_matcher('finsen')
+    general_matcher = get_matcher('finsen_general')
     
     # All CSV files you have
     csv_files = [
@@ -44,52 +44,44 @@ def process_finsen_data():
             
         print(f"\n📁 Processing {file_name}...")
         
-        # Load the CSV file
-        df = pd.read_csv(file_path)
-        print(f"   Loaded {len(df)} rows")
-        
-        # Add source file identifier
-        df['Source_File'] = file_name
+        total_rows = 0
+        relevant_chunks = []
         
-        # Filter for relevant headlines
-        relevant_rows = []
-        
-        for idx, row in df.iterrows():
-            title = str(row['Title']).lower()
-            content = str(row.get('Content', '')).lower()
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+            total_rows += len(chunk)
+            
+            # Add source file identifier
+            chunk['Source_File'] = file_name
             
-            # Check for Indian stock mentions
-            is_relevant = False
-            matched_ticker = None
+            title = chunk['Title']
+            content = chunk['Content'] if 'Content' in chunk.columns else pd.Series('', index=chunk.index)
+            title_hits = stock_matcher.keyword_masks(title)
+            content_hits = stock_matcher.keyword_masks(content)
             
-            # Check each stock
-            for ticker, keywords in indian_stocks.items():
-                for keyword in keywords:
-                    if keyword.lower() in title or keyword.lower() in content:
-                        is_relevant = True
-                        matched_ticker = ticker
-                        break
-                if is_relevant:
-                    break
+            # First stock in registry order with a mention wins, then general keywords
+            stock_masks = stock_matcher.label_masks(title_hits | content_hits)
+            general_mask = (general_matcher.keyword_masks(title).any(axis=1) |
+                            general_matcher.keyword_masks(content).any(axis=1))
+            conditions = [stock_masks[t].to_numpy() for t in stock_masks.columns] + [general_mask.to_numpy()]
+            choices = list(stock_masks.columns) + ['GENERAL_FINANCIAL']
+            matched_ticker = np.select(conditions, choices, default='')
             
-            # Check for general financial keywords if no specific stock match
-            if not is_relevant:
-                for keyword in general_keywords:
-                    if keyword.lower() in title or keyword.lower() in content:
-                        is_relevant = True
-                        matched_ticker = 'GENERAL_FINANCIAL'
-                        break
+            relevant = matched_ticker != ''
+            if not relevant.any():
+                continue
             
-            if is_relevant:
-                row_data = row.copy()
-                row_data['Matched_Ticker'] = matched_ticker
-                row_data['Relevance_Score'] = calculate_relevance_score(title, content, indian_stocks)
-                relevant_rows.append(row_data)
+            scores = calculate_relevance_score(title, content, title_hits, content_hits)
+            relevant_chunks.append(chunk[relevant].assign(
+                Matched_Ticker=matched_ticker[relevant],
+                Relevance_Score=scores[relevant]
+            ))
         
-        if relevant_rows:
-            file_df = pd.DataFrame(relevant_rows)
+        print(f"   Loaded {total_rows} rows")
+        
+        if relevant_chunks:
+            file_df = pd.concat(relevant_chunks)
             all_processed_data.append(file_df)
-            print(f"   ✅ Found {len(relevant_rows)} relevant headlines")
+            print(f"   ✅ Found {len(file_df)} relevant headlines")
         else:
             print(f"   ❌ No relevant headlines found")
     
@@ -125,31 +117,36 @@ def process_finsen_data():
         print("❌ No relevant data found in any files!")
         return None
 
-def calculate_relevance_score(title, content, indian_stocks):
+def calculate_relevance_score(titles, contents, title_hits=None, content_hits=None):
     """
-    Calculate relevance score based on keyword matches and context
+    Calculate relevance scores for Series of titles and contents, based on
+    keyword matches and context. title_hits/content_hits are the stock
+    matcher's keyword_masks, passed in when the caller already has them.
     """
-    score = 0
-    title_lower = title.lower()
-    content_lower = content.lower()
+    stock_matcher = get_matcher('finsen')
+    if title_hits is None:
+        title_hits = stock_matcher.keyword_masks(titles)
+    if content_hits is None:
+        content_hits = stock_matcher.keyword_masks(contents)
+    
+    score = np.zeros(len(titles), dtype=np.int64)
     
     # Higher score for Indian stock mentions
-    for ticker, keywords in indian_stocks.items():
+    for ticker, keywords in stock_matcher.groups.items():
         for keyword in keywords:
-            if keyword.lower() in title_lower:
-                score += 10  # Title mentions are more important
-            elif keyword.lower() in content_lower:
-                score += 5   # Content mentions
+            in_title = title_hits[keyword.lower()].to_numpy()
+            in_content = content_hits[keyword.lower()].to_numpy()
+            # Title mentions are more important than content mentions
+            score += np.where(in_title, 10, np.where(in_content, 5, 0))
     
     # Additional points for financial context
-    financial_terms = ['stock', 'share', 'market', 'trading', 'investment', 
-                      'earnings', 'revenue', 'profit', 'loss', 'growth']
+    term_matcher = get_matcher('finsen_terms')
+    title_terms = term_matcher.keyword_masks(titles)
+    content_terms = term_matcher.keyword_masks(contents)
     
-    for term in financial_terms:
-        if term in title_lower:
-            score += 2
-        elif term in content_lower:
-            score += 1
+    for term in FINSEN_FINANCIAL_TERMS:
+        score += np.where(title_terms[term].to_numpy(), 2,
+                          np.where(content_terms[term].to_numpy(), 1, 0))
     
     return score
 
@@ -2,87 +2,95 @@ import os, sys
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root_dir)
 
-import requests
+import asyncio
 from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime, timedelta
-import time
-import random
-from config import STOCK_SYMBOLS
+from config import STOCK_SYMBOLS, COMPANY_NAMES, HTTP_CACHE_DIR
+
+sys.path.append(os.path.join(root_dir, 'backend'))
+from news_store import NewsStore
+from async_fetcher import AsyncFetcher, DEFAULT_HEADERS
+from http_cache import HttpCache, CachedFetcher
+
+# Site roots, overridable so the scraper can run against a local fixture server
+BASE_URLS = {
+    'moneycontrol': 'https://www.moneycontrol.com',
+    'economic_times': 'https://economictimes.indiatimes.com',
+    'business_standard': 'https://www.business-standard.com'
+}
 
 class NewsScraperMerger:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    def __init__(self, base_urls=None, requests_per_second=0.5, per_host=2, cache_dir=HTTP_CACHE_DIR):
+        self.headers = DEFAULT_HEADERS
+        self.base_urls = {**BASE_URLS, **(base_urls or {})}
+        # Per-host politeness: token bucket rate and concurrent connections
+        self.requests_per_second = requests_per_second
+        self.per_host = per_host
+        self.cache_dir = cache_dir
         self.existing_csv_path = os.path.join(root_dir, 'data/financial_news.csv')
         self.new_headlines = []
         
-    def scrape_moneycontrol_stock_news(self, ticker_symbol, company_name, max_pages=5):
+    async def scrape_moneycontrol_stock_news(self, fetcher, ticker_symbol, company_name, max_pages=5):
         """Scrape MoneyControl for stock-specific news"""
         print(f"🔍 Scraping MoneyControl for {company_name} ({ticker_symbol})...")
         
         # MoneyControl search URL format
         search_term = company_name.replace(' ', '+')
-        base_url = f"https://www.moneycontrol.com/news/tags/{search_term.lower()}.html"
+        base_url = f"{self.base_urls['moneycontrol']}/news/tags/{search_term.lower()}.html"
+        urls = [f"{base_url}?page={page}" if page > 1 else base_url for page in range(1, max_pages + 1)]
         
-        try:
-            for page in range(1, max_pages + 1):
-                url = f"{base_url}?page={page}" if page > 1 else base_url
-                response = requests.get(url, headers=self.headers)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find news articles
-                articles = soup.find_all('li', class_='clearfix')
-                
-                for article in articles:
-                    try:
-                        # Extract title
-                        title_element = article.find('a')
-                        if title_element:
-                            title = title_element.get_text().strip()
-                            
-                            # Extract date
-                            date_element = article.find('span')
-                            if date_element:
-                                date_text = date_element.get_text().strip()
-                                # Parse date (format: "October 02, 2025")
+        for response in await fetcher.fetch_all(urls):
+            if isinstance(response, Exception):
+                print(f"❌ Error scraping MoneyControl for {ticker_symbol}: {response}")
+                continue
+            soup = BeautifulSoup(response.body, 'html.parser')
+            
+            # Find news articles
+            articles = soup.find_all('li', class_='clearfix')
+            
+            for article in articles:
+                try:
+                    # Extract title
+                    title_element = article.find('a')
+                    if title_element:
+                        title = title_element.get_text().strip()
+                        
+                        # Extract date
+                        date_element = article.find('span')
+                        if date_element:
+                            date_text = date_element.get_text().strip()
+                            # Parse date (format: "October 02, 2025")
+                            try:
+                                date_obj = datetime.strptime(date_text, "%B %d, %Y")
+                            except:
+                                # Try alternative format
                                 try:
-                                    date_obj = datetime.strptime(date_text, "%B %d, %Y")
+                                    date_obj = datetime.strptime(date_text, "%b %d, %Y")
                                 except:
-                                    # Try alternative format
-                                    try:
-                                        date_obj = datetime.strptime(date_text, "%b %d, %Y")
-                                    except:
-                                        date_obj = datetime.now()  # Default to today
-                                
-                                self.new_headlines.append({
-                                    'Date': date_obj,
-                                    'Title': title,
-                                    'Description': title,  # Use title as description
-                                    'Source': 'MoneyControl',
-                                    'Ticker': ticker_symbol.replace('.NS', '')
-                                })
-                    except Exception as e:
-                        continue
-                        
-                # Random delay to be respectful
-                time.sleep(random.uniform(1, 3))
-                
-        except Exception as e:
-            print(f"❌ Error scraping MoneyControl for {ticker_symbol}: {e}")
+                                    date_obj = datetime.now()  # Default to today
+                            
+                            self.new_headlines.append({
+                                'Date': date_obj,
+                                'Title': title,
+                                'Description': title,  # Use title as description
+                                'Source': 'MoneyControl',
+                                'Ticker': ticker_symbol.replace('.NS', '')
+                            })
+                except Exception as e:
+                    continue
     
-    def scrape_economic_times_news(self, ticker_symbol, company_name, max_articles=50):
+    async def scrape_economic_times_news(self, fetcher, ticker_symbol, company_name, max_articles=50):
         """Scrape Economic Times for stock news"""
         print(f"🔍 Scraping Economic Times for {company_name}...")
         
         try:
             # Economic Times search URL
             search_term = company_name.replace(' ', '%20')
-            url = f"https://economictimes.indiatimes.com/topic/{search_term}"
+            url = f"{self.base_urls['economic_times']}/topic/{search_term}"
             
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = await fetcher.fetch(url)
+            soup = BeautifulSoup(response.body, 'html.parser')
             
             # Find news articles
             articles = soup.find_all('div', class_='eachStory')[:max_articles]
@@ -120,22 +128,20 @@ class NewsScraperMerger:
                             })
                 except Exception as e:
                     continue
-                    
-            time.sleep(random.uniform(2, 4))
             
         except Exception as e:
             print(f"❌ Error scraping Economic Times for {ticker_symbol}: {e}")
     
-    def scrape_business_standard_news(self, ticker_symbol, company_name):
+    async def scrape_business_standard_news(self, fetcher, ticker_symbol, company_name):
         """Scrape Business Standard for additional coverage"""
         print(f"🔍 Scraping Business Standard for {company_name}...")
         
         try:
             search_term = company_name.replace(' ', '-').lower()
-            url = f"https://www.business-standard.com/topic/{search_term}"
+            url = f"{self.base_urls['business_standard']}/topic/{search_term}"
             
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = await fetcher.fetch(url)
+            soup = BeautifulSoup(response.body, 'html.parser')
             
             # Find articles
             articles = soup.find_all('div', class_='listingstory')[:20]
@@ -166,38 +172,42 @@ class NewsScraperMerger:
                         })
                 except:
                     continue
-                    
-            time.sleep(random.uniform(1, 2))
             
         except Exception as e:
             print(f"❌ Error scraping Business Standard for {ticker_symbol}: {e}")
     
+    async def scrape_stock(self, fetcher, ticker, company_name):
+        """Scrape all sources for one stock concurrently"""
+        print(f"\n📰 Scraping news for {company_name}...")
+        await asyncio.gather(
+            self.scrape_moneycontrol_stock_news(fetcher, ticker, company_name, max_pages=3),
+            self.scrape_economic_times_news(fetcher, ticker, company_name, max_articles=30),
+            self.scrape_business_standard_news(fetcher, ticker, company_name)
+        )
+        print(f"✅ Collected {len([h for h in self.new_headlines if h['Ticker'] == ticker.replace('.NS', '')])} headlines for {company_name}")
+    
+    async def scrape_all_stocks_async(self):
+        # One keep-alive pool for every source; per-host token buckets replace the blind sleeps.
+        # Pages are revalidated with ETag/Last-Modified once their cached copy is stale.
+        async with AsyncFetcher(requests_per_second=self.requests_per_second,
+                                per_host=self.per_host, headers=self.headers) as fetcher:
+            cached = CachedFetcher(fetcher, HttpCache(self.cache_dir))
+            await asyncio.gather(*(
+                self.scrape_stock(cached, ticker, COMPANY_NAMES[ticker])
+                for ticker in STOCK_SYMBOLS
+            ))
+        print(f"🗄️  Pages: {cached.summary()}")
+    
     def scrape_all_stocks(self):
         """Scrape news for all stocks"""
         print("🚀 Starting news scraping for all stocks...")
-        
-        for ticker, company_name in STOCK_SYMBOLS.items():
-            print(f"\n📰 Scraping news for {company_name}...")
-            
-            # Scrape from all sources
-            self.scrape_moneycontrol_stock_news(ticker, company_name, max_pages=3)
-            self.scrape_economic_times_news(ticker, company_name, max_articles=30)
-            self.scrape_business_standard_news(ticker, company_name)
-            
-            print(f"✅ Collected {len([h for h in self.new_headlines if h['Ticker'] == ticker.replace('.NS', '')])} headlines for {company_name}")
-            
-            # Longer delay between stocks
-            time.sleep(random.uniform(3, 7))
+        asyncio.run(self.scrape_all_stocks_async())
     
     def merge_with_existing_csv(self):
-        """Merge scraped data with existing CSV"""
-        print("\n🔗 Merging with existing CSV...")
+        """Append scraped headlines to the news store, skipping ones it already holds for that ticker and day"""
+        print("\n🔗 Merging with existing news store...")
         
         try:
-            # Load existing CSV
-            existing_df = pd.read_csv(self.existing_csv_path, parse_dates=['Date'])
-            print(f"📊 Existing CSV has {len(existing_df)} records")
-            
             # Convert new headlines to DataFrame
             new_df = pd.DataFrame(self.new_headlines)
             print(f"📊 Scraped {len(new_df)} new headlines")
@@ -206,38 +216,31 @@ class NewsScraperMerger:
                 print("❌ No new headlines scraped. Check your internet connection or website changes.")
                 return
             
-            # Ensure same columns
-            if 'Description' not in existing_df.columns:
-                existing_df['Description'] = existing_df['Title']
-            if 'Source' not in existing_df.columns:
-                existing_df['Source'] = 'Original CSV'
-            if 'Ticker' not in existing_df.columns:
-                existing_df['Ticker'] = 'Unknown'
-            
-            # Combine DataFrames
-            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-            
-            # Remove duplicates based on Date and Title
-            combined_df = combined_df.drop_duplicates(subset=['Date', 'Title'], keep='first')
-            
-            # Sort by date
-            combined_df = combined_df.sort_values('Date').reset_index(drop=True)
-            
-            # Save back to CSV
-            combined_df.to_csv(self.existing_csv_path, index=False)
+            store = NewsStore()
+            try:
+                # One-time migration of the legacy single-file CSV
+                if store.count() == 0 and os.path.exists(self.existing_csv_path):
+                    imported = store.import_csv(self.existing_csv_path, parse_dates=['Date'])
+                    print(f"📊 Imported {imported} records from existing CSV")
+                
+                # Only the new batch is keyed by (title, ticker, day) and checked against the persistent index
+                added = store.add(new_df)
+                total = store.count()
+            finally:
+                store.close()
             
-            print(f"✅ Merged CSV saved with {len(combined_df)} total records")
-            print(f"📈 Added {len(combined_df) - len(existing_df)} new unique headlines")
+            print(f"✅ News store now holds {total} total records")
+            print(f"📈 Added {len(added)} new unique headlines")
             
             # Show summary by ticker
-            print("\n📊 Headlines by ticker after merge:")
-            for ticker in STOCK_SYMBOLS.keys():
+            print("\n📊 New headlines by ticker:")
+            for ticker in STOCK_SYMBOLS:
                 clean_ticker = ticker.replace('.NS', '')
-                count = combined_df['Title'].str.contains(clean_ticker, case=False, na=False).sum()
+                count = added['Title'].str.contains(clean_ticker, case=False, na=False).sum()
                 print(f"{clean_ticker}: {count} mentions")
                 
         except Exception as e:
-            print(f"❌ Error merging CSV: {e}")
+            print(f"❌ Error merging news: {e}")
     
     def run(self):
         """Execute complete scraping and merging process"""
@@ -4,46 +4,94 @@ import os, sys
 root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(root)
 
-import requests
+import asyncio
 from bs4 import BeautifulSoup
 import pandas as pd
-from datetime import datetime
-from config import NEWS_CSV_PATH
+from datetime import datetime, timedelta
+from config import NEWS_CSV_PATH, HTTP_CACHE_DIR
 
-def scrape_moneycontrol(ticker, start_year=2021, end_year=2025):
+sys.path.append(os.path.join(root, 'backend'))
+from news_store import NewsStore
+from async_fetcher import AsyncFetcher
+from http_cache import HttpCache, CachedFetcher
+
+# Overridable so the scraper can run against a local fixture server
+MONEYCONTROL_NEWS_URL = "https://www.moneycontrol.com/stocks/company_info/stock_news.php"
+
+# Bump when parse_month_page changes so cached parsed pages are re-parsed
+PARSER_KEY = 'moneycontrol-month-v1'
+
+def month_url(ticker, year, month, base_url=MONEYCONTROL_NEWS_URL):
+    return f"{base_url}?sc{ticker.replace('.NS','').lower()}=MC2&month={month}&year={year}"
+
+def month_closed_at(year, month):
+    """When a month's news page stops changing: the next month's start, plus a day of grace"""
+    next_month = datetime(year + month // 12, month % 12 + 1, 1)
+    return next_month + timedelta(days=1)
+
+def parse_month_page(html):
+    """Headlines ({'Date', 'Title'}) listed on one MoneyControl monthly news page.
+    Dates are ISO strings so parsed pages round-trip through the cache unchanged."""
+    news = []
+    soup = BeautifulSoup(html, 'lxml')
+    for item in soup.select('.clearfix .PT10 a'):
+        date_str = item.find_previous('span').text.strip()
+        # parse date like 'Sep 19, 2025'
+        try:
+            date = datetime.strptime(date_str, '%b %d, %Y').date()
+        except:
+            continue
+        headline = item.text.strip()
+        news.append({'Date': date.isoformat(), 'Title': headline})
+    return news
+
+async def scrape_moneycontrol_async(fetcher, ticker, start_year=2021, end_year=2025,
+                                    base_url=MONEYCONTROL_NEWS_URL):
+    """fetcher is a CachedFetcher: past months are served from the cache, parsed"""
+    months = [(year, month) for year in range(start_year, end_year+1) for month in range(1,13)]
+    urls = [month_url(ticker, year, month, base_url) for year, month in months]
+    results = await asyncio.gather(*(
+        fetcher.fetch_parsed(url, lambda resp: parse_month_page(resp.text), PARSER_KEY,
+                             closed_at=month_closed_at(year, month))
+        for url, (year, month) in zip(urls, months)
+    ), return_exceptions=True)
     all_news = []
-    for year in range(start_year, end_year+1):
-        for month in range(1,13):
-            url = f"https://www.moneycontrol.com/stocks/company_info/stock_news.php?sc{ticker.replace('.NS','').lower()}=MC2&month={month}&year={year}"
-            resp = requests.get(url)
-            soup = BeautifulSoup(resp.text, 'lxml')
-            for item in soup.select('.clearfix .PT10 a'):
-                date_str = item.find_previous('span').text.strip()
-                # parse date like 'Sep 19, 2025'
-                try:
-                    date = datetime.strptime(date_str, '%b %d, %Y').date()
-                except:
-                    continue
-                headline = item.text.strip()
-                all_news.append({'Date': date, 'Title': headline})
-    return pd.DataFrame(all_news)
+    for url, news in zip(urls, results):
+        if isinstance(news, Exception):
+            print(f"⚠️  Failed to fetch {url}: {news}")
+            continue
+        all_news.extend(news)
+    df = pd.DataFrame(all_news, columns=['Date', 'Title'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df
+
+async def scrape_tickers_async(tickers, start_year=2021, end_year=2025, base_url=MONEYCONTROL_NEWS_URL,
+                               requests_per_second=2.0, per_host=4, cache_dir=HTTP_CACHE_DIR):
+    # Every ticker-month page shares one keep-alive pool and one per-host rate limit
+    async with AsyncFetcher(requests_per_second=requests_per_second, per_host=per_host) as fetcher:
+        cached = CachedFetcher(fetcher, HttpCache(cache_dir))
+        frames = await asyncio.gather(*(
+            scrape_moneycontrol_async(cached, t, start_year, end_year, base_url) for t in tickers
+        ))
+    print(f"🗄️  Pages: {cached.summary()}")
+    for t, df in zip(tickers, frames):
+        df['Ticker'] = t.replace('.NS','')
+    return pd.concat(frames, ignore_index=True)
+
+def scrape_moneycontrol(ticker, start_year=2021, end_year=2025, base_url=MONEYCONTROL_NEWS_URL):
+    df = asyncio.run(scrape_tickers_async([ticker], start_year, end_year, base_url))
+    return df.drop(columns='Ticker')
 
 if __name__ == "__main__":
     tickers = ['TCS.NS','HDFCBANK.NS','BAJFINANCE.NS','ASIANPAINT.NS','LEMONTREE.NS','VBL.NS']
-    df_list = []
-    for t in tickers:
-        code = t.replace('.NS','')
-        print(f"Scraping {code}...")
-        df = scrape_moneycontrol(t)
-        df['Ticker'] = code
-        df_list.append(df)
-    new_df = pd.concat(df_list, ignore_index=True)
-    # Append to existing CSV
-    csv_path = os.path.join(root, NEWS_CSV_PATH)
-    if os.path.exists(csv_path):
-        old = pd.read_csv(csv_path, parse_dates=['Date'])
-        combined = pd.concat([old, new_df]).drop_duplicates(['Date','Title','Ticker'])
-    else:
-        combined = new_df
-    combined.to_csv(csv_path, index=False)
-    print("✅ Updated news CSV through 2025")
+    print(f"Scraping {', '.join(t.replace('.NS','') for t in tickers)}...")
+    new_df = asyncio.run(scrape_tickers_async(tickers))
+    # Append to the news store; headlines it already holds for that ticker and day are skipped
+    store = NewsStore()
+    try:
+        if store.count() == 0 and os.path.exists(NEWS_CSV_PATH):
+            store.import_csv(NEWS_CSV_PATH, parse_dates=['Date'])
+        added = store.add(new_df)
+    finally:
+        store.close()
+    print(f"✅ Added {len(added)} new headlines through 2025")
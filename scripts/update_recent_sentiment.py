@@ -1,8 +1,10 @@
 # scripts/update_recent_sentiment.py
 
+import argparse
 import os
 import sys
 import re
+import time
 import pandas as pd
 import mysql.connector
 from datetime import datetime
@@ -16,7 +18,12 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'backend'))
+
 from config import DATABASE_CONFIG
+from sentiment_cache import SentimentCache
+from sentiment_scoring import aggregate_daily, SENTIMENT_STAT_COLUMNS
+from bulk_loader import BufferedWriter, DEFAULT_BATCH_SIZE, ensure_columns
 
 # Parameters
 INPUT_FILE = 'data/finsen_processed.csv'
@@ -40,32 +47,39 @@ def filter_finsen():
     print(f"Filtered {len(recent)} rows from {INPUT_FILE} into {FILTERED_FILE}")
     return recent
 
-def update_sentiment_table(df):
+def update_sentiment_table(df, workers=1, batch_size=DEFAULT_BATCH_SIZE):
     # Connect to DB
     conn = mysql.connector.connect(**DATABASE_CONFIG)
-    cur = conn.cursor()
-    # Clear old entries in date range
-    cur.execute(f"""
-        DELETE FROM sentiment_data
-        WHERE Date BETWEEN %s AND %s;
-    """, (START_DATE, END_DATE))
-    conn.commit()
-    analyzer = SentimentIntensityAnalyzer()
-    # Insert new sentiment records
-    for _, row in df.iterrows():
-        date = row['pub_date'].date()
-        title = row['Title']
-        score = analyzer.polarity_scores(str(title))['compound']
-        # Assign ticker GENERAL_FINANCIAL as placeholder
-        cur.execute("""
-            INSERT INTO sentiment_data (Date, Ticker, SentimentScore, Headline)
-            VALUES (%s,%s,%s,%s);
-        """, (date, 'GENERAL_FINANCIAL', score, title))
-    conn.commit()
-    cur.close()
+    ensure_columns(conn, 'sentiment_data', SENTIMENT_STAT_COLUMNS)
+    cache = SentimentCache(SentimentIntensityAnalyzer(), workers=workers)
+    start = time.perf_counter()
+    scores = cache.compound_many(df['Title'].astype(str))
+    elapsed = time.perf_counter() - start
+    cache.close()
+    print(f"Scored {len(scores)} headlines ({cache.misses} new) with {workers} worker(s) "
+          f"at {len(scores) / max(elapsed, 1e-9):.0f} headlines/sec")
+    # Aggregate to one row per day; ticker GENERAL_FINANCIAL is a market-wide placeholder.
+    # The upsert replaces earlier runs' rows and leaves per-ticker rows alone.
+    daily = aggregate_daily(df.assign(ticker='GENERAL_FINANCIAL', score=scores), 'ticker', 'pub_date')
+    insert_sql = """
+        INSERT INTO sentiment_data
+          (ticker, date, sentiment_score, tweet_count, news_count, min_score, max_score)
+        VALUES (%s,%s,%s,0,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE
+          sentiment_score=VALUES(sentiment_score), news_count=VALUES(news_count),
+          min_score=VALUES(min_score), max_score=VALUES(max_score);
+    """
+    with BufferedWriter(conn, insert_sql, batch_size) as writer:
+        writer.add_frame(daily, ['ticker', 'date', 'sentiment_score', 'news_count', 'min_score', 'max_score'])
     conn.close()
-    print(f"Inserted {len(df)} new sentiment records into database")
+    print(f"Inserted {len(daily)} daily sentiment records ({len(df)} headlines) into database")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score recent FinSen headlines into sentiment_data")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="processes used for VADER scoring")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="rows per executemany/commit")
+    args = parser.parse_args()
     recent_df = filter_finsen()
-    update_sentiment_table(recent_df)
+    update_sentiment_table(recent_df, workers=args.workers, batch_size=args.batch_size)
@@ -1,5 +1,4 @@
 import mysql.connector
-import pandas as pd
 import sys
 import os
 
@@ -9,6 +8,9 @@ sys.path.insert(0, project_root)
 
 from config import DATABASE_CONFIG
 
+sys.path.insert(0, os.path.join(project_root, 'backend'))
+from news_store import load_news
+
 def check_project_status():
     print("🔍 CHECKING PROJECT STATUS...\n")
     
@@ -39,10 +41,10 @@ def check_project_status():
     else:
         print("  ❌ No sentiment data found")
     
-    # 4. Check CSV file
-    print("\n📰 NEWS CSV STATUS:")
+    # 4. Check stored news
+    print("\n📰 NEWS STORE STATUS:")
     try:
-        df = pd.read_csv('data/financial_news.csv', parse_dates=['Date'])
+        df = load_news()
         print(f"  Total headlines: {len(df)}")
         print(f"  Date range: {df['Date'].min()} to {df['Date'].max()}")
         
@@ -52,7 +54,7 @@ def check_project_status():
                 count = (df['Ticker'] == ticker).sum()
                 print(f"    {ticker}: {count}")
     except Exception as e:
-        print(f"  ❌ Error reading CSV: {e}")
+        print(f"  ❌ Error reading news: {e}")
     
     cursor.close()
     conn.close()
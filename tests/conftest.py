@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Backend and scripts modules import each other flat, as they do when run directly
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'backend'),
+             os.path.join(PROJECT_ROOT, 'scripts'), os.path.dirname(__file__)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
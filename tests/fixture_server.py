@@ -0,0 +1,90 @@
+import asyncio
+import os
+import re
+import time
+from collections import defaultdict, deque
+
+from aiohttp import web
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'news')
+
+# First path segment -> recorded page served for every search under it
+SITE_PAGES = {
+    'moneycontrol': 'moneycontrol_tag.html',
+    'economic_times': 'economic_times_topic.html',
+    'business_standard': 'business_standard_topic.html',
+}
+
+class FixtureServer:
+    """Local stand-in for the news sites, serving recorded pages on 127.0.0.1.
+
+    Each site lives under its own prefix (base_urls() maps BASE_URLS keys to
+    them), and the company in the request path is substituted into the page.
+    Failures can be scripted per path with fail(), every request is logged
+    with its arrival time, and `delay` holds each response so concurrency
+    limits can be observed through max_in_flight.
+
+        async with FixtureServer() as server:
+            server.fail('/ok', 503)
+            ...
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self.failures = defaultdict(deque)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.url = None
+        self._runner = None
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._runner.cleanup()
+        return False
+
+    def base_urls(self):
+        return {site: f"{self.url}/{site}" for site in SITE_PAGES}
+
+    def fail(self, path, *statuses, headers=None):
+        """Answer the next requests for path (with query string) with these statuses, in order"""
+        for status in statuses:
+            self.failures[path].append((status, headers or {}))
+
+    def hits(self, path):
+        return [t for p, t in self.requests if p == path]
+
+    async def handle(self, request):
+        self.requests.append((request.path_qs, time.monotonic()))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.failures[request.path_qs]:
+                status, headers = self.failures[request.path_qs].popleft()
+                return web.Response(status=status, headers=headers, text='unavailable')
+            return self.page(request.path)
+        finally:
+            self.in_flight -= 1
+
+    def page(self, path):
+        site, _, rest = path.lstrip('/').partition('/')
+        if site not in SITE_PAGES:
+            return web.Response(text='ok')
+        slug = os.path.splitext(rest.rsplit('/', 1)[-1])[0]
+        company = ' '.join(word.capitalize() for word in re.split(r'[\s+\-]+', slug) if word)
+        with open(os.path.join(FIXTURE_DIR, SITE_PAGES[site]), encoding='utf-8') as f:
+            html = f.read()
+        html = html.replace('{company}', company).replace('{slug}', slug.lower())
+        return web.Response(text=html, content_type='text/html')
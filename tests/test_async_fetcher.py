@@ -0,0 +1,91 @@
+import asyncio
+
+from async_fetcher import AsyncFetcher
+from fixture_server import FixtureServer
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_retries_transient_statuses_until_success():
+    async def scenario():
+        async with FixtureServer() as server:
+            server.fail('/ok', 503, 502)
+            async with AsyncFetcher(requests_per_second=100, retries=3, backoff=0.01) as fetcher:
+                result = await fetcher.fetch(f"{server.url}/ok")
+            return result, len(server.hits('/ok'))
+
+    result, hits = run(scenario())
+    assert result.status == 200
+    assert result.text == 'ok'
+    assert hits == 3
+
+def test_returns_last_response_when_retries_run_out():
+    async def scenario():
+        async with FixtureServer() as server:
+            server.fail('/ok', 503, 503, 503, 503)
+            async with AsyncFetcher(requests_per_second=100, retries=2, backoff=0.01) as fetcher:
+                result = await fetcher.fetch(f"{server.url}/ok")
+            return result, len(server.hits('/ok'))
+
+    result, hits = run(scenario())
+    assert result.status == 503
+    assert hits == 3
+
+def test_client_errors_are_not_retried():
+    async def scenario():
+        async with FixtureServer() as server:
+            server.fail('/ok', 404)
+            async with AsyncFetcher(requests_per_second=100, retries=3, backoff=0.01) as fetcher:
+                result = await fetcher.fetch(f"{server.url}/ok")
+            return result, len(server.hits('/ok'))
+
+    result, hits = run(scenario())
+    assert result.status == 404
+    assert hits == 1
+
+def test_honors_retry_after_on_429():
+    async def scenario():
+        async with FixtureServer() as server:
+            server.fail('/ok', 429, headers={'Retry-After': '1'})
+            async with AsyncFetcher(requests_per_second=100, retries=3, backoff=0.01) as fetcher:
+                result = await fetcher.fetch(f"{server.url}/ok")
+            return result, server.hits('/ok')
+
+    result, hits = run(scenario())
+    assert result.status == 200
+    assert len(hits) == 2
+    assert hits[1] - hits[0] >= 0.95
+
+def test_connection_errors_raise_after_retries():
+    async def scenario():
+        async with FixtureServer() as server:
+            url = f"{server.url}/ok"
+        # Server is shut down: every attempt is refused
+        async with AsyncFetcher(requests_per_second=100, retries=1, backoff=0.01) as fetcher:
+            return await fetcher.fetch_all([url])
+
+    (result,) = run(scenario())
+    assert isinstance(result, Exception)
+
+def test_token_bucket_limits_request_rate():
+    async def scenario():
+        async with FixtureServer() as server:
+            async with AsyncFetcher(requests_per_second=20, burst=1, per_host=8, backoff=0.01) as fetcher:
+                await fetcher.fetch_all([f"{server.url}/ok"] * 6)
+            return server.hits('/ok')
+
+    hits = run(scenario())
+    assert len(hits) == 6
+    # One token up front, then one every 50 ms
+    assert hits[-1] - hits[0] >= 5 / 20 * 0.9
+
+def test_per_host_cap_limits_concurrent_requests():
+    async def scenario():
+        async with FixtureServer(delay=0.1) as server:
+            async with AsyncFetcher(requests_per_second=1000, burst=100, per_host=2) as fetcher:
+                results = await fetcher.fetch_all([f"{server.url}/ok"] * 8)
+            return results, server.max_in_flight
+
+    results, max_in_flight = run(scenario())
+    assert all(r.status == 200 for r in results)
+    assert max_in_flight == 2
@@ -0,0 +1,95 @@
+import datetime
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bulk_loader import BufferedWriter, bulk_upsert, ensure_columns, to_db_rows
+
+class CountingConnection(sqlite3.Connection):
+    """sqlite3 stand-in for the MySQL connection that counts commits"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+        super().commit()
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:', factory=CountingConnection)
+    conn.execute("CREATE TABLE macro (date DATE PRIMARY KEY, usd_inr_rate REAL, interest_rate REAL)")
+    conn.commit()
+    conn.commits = 0
+    yield conn
+    conn.close()
+
+def macro_frame(days, start='2024-01-01', rate=83.0):
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=days),
+        'usd_inr_rate': rate,
+        'interest_rate': 6.5,
+    })
+
+def rows(conn, table='macro'):
+    return conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+
+def test_to_db_rows_turns_missing_values_into_none():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-01', None]),
+        'rate': [np.nan, 1.5],
+        'volume': np.array([10, 20], dtype='int64'),
+    })
+    assert to_db_rows(df, ['date', 'rate', 'volume']) == [
+        (datetime.date(2024, 1, 1), None, 10),
+        (None, 1.5, 20),
+    ]
+    assert type(to_db_rows(df, ['volume'])[0][0]) is int
+
+def test_bulk_upsert_writes_nulls_and_updates_existing_keys(conn):
+    first = macro_frame(3)
+    first.loc[1, 'usd_inr_rate'] = np.nan
+    assert bulk_upsert(conn, 'macro', first, ['date', 'usd_inr_rate', 'interest_rate']) == 3
+    assert rows(conn)[1] == ('2024-01-02', None, 6.5)
+
+    bulk_upsert(conn, 'macro', macro_frame(2, start='2024-01-02', rate=84.0),
+                ['date', 'usd_inr_rate', 'interest_rate'])
+    assert rows(conn) == [
+        ('2024-01-01', 83.0, 6.5),
+        ('2024-01-02', 84.0, 6.5),
+        ('2024-01-03', 84.0, 6.5),
+    ]
+
+def test_bulk_upsert_commits_once_per_chunk(conn):
+    bulk_upsert(conn, 'macro', macro_frame(10), ['date', 'usd_inr_rate', 'interest_rate'], batch_size=4)
+    assert len(rows(conn)) == 10
+    assert conn.commits == 3
+
+def test_ensure_columns_adds_only_missing_columns(conn):
+    added = ensure_columns(conn, 'macro', {'interest_rate': 'REAL', 'unemployment_rate': 'REAL'})
+    assert added == ['unemployment_rate']
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(macro)")]
+    assert columns == ['date', 'usd_inr_rate', 'interest_rate', 'unemployment_rate']
+    assert ensure_columns(conn, 'macro', {'unemployment_rate': 'REAL'}) == []
+
+INSERT_SQL = "INSERT INTO macro (date, usd_inr_rate, interest_rate) VALUES (?, ?, ?)"
+
+def test_buffered_writer_flushes_the_tail_on_close(conn):
+    writer = BufferedWriter(conn, INSERT_SQL, batch_size=4)
+    writer.add_frame(macro_frame(6), ['date', 'usd_inr_rate', 'interest_rate'])
+    assert len(rows(conn)) == 4
+    writer.close()
+    assert len(rows(conn)) == 6
+    assert writer.written == 6
+    assert conn.commits == 2
+
+def test_buffered_writer_flushes_the_tail_when_the_block_raises(conn):
+    with pytest.raises(RuntimeError, match='source failed'):
+        with BufferedWriter(conn, INSERT_SQL, batch_size=4) as writer:
+            writer.add_frame(macro_frame(6), ['date', 'usd_inr_rate', 'interest_rate'])
+            raise RuntimeError('source failed')
+    assert len(rows(conn)) == 6
+    assert writer.written == 6
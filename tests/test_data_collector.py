@@ -0,0 +1,121 @@
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+from data_collector import StockDataCollector
+
+class FakeYFinance:
+    """Stands in for the yfinance module: Ticker(symbol).history(start=, end=).
+
+    Every ticker gets `days` business days of prices; failures[symbol] is the
+    number of leading calls for that symbol that raise. Symbols in
+    no_volume come back without a volume on their first day.
+    """
+
+    def __init__(self, days=5, failures=None, missing=(), no_volume=()):
+        self.days = days
+        self.failures = dict(failures or {})
+        self.missing = set(missing)
+        self.no_volume = set(no_volume)
+        self.calls = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def Ticker(self, symbol):
+        return FakeTicker(self, symbol)
+
+class FakeTicker:
+    def __init__(self, provider, symbol):
+        self.provider = provider
+        self.symbol = symbol
+
+    def history(self, start=None, end=None):
+        provider = self.provider
+        with provider.lock:
+            provider.calls[self.symbol] += 1
+            if provider.failures.get(self.symbol, 0):
+                provider.failures[self.symbol] -= 1
+                raise ConnectionError(f"{self.symbol}: too many requests")
+        if self.symbol in provider.missing:
+            return pd.DataFrame()
+        index = pd.bdate_range(start, periods=provider.days, name='Date')
+        close = pd.Series(range(provider.days), index=index, dtype='float64') + 100
+        volume = pd.Series(1000.0, index=index)
+        if self.symbol in provider.no_volume:
+            volume.iloc[0] = float('nan')
+        return pd.DataFrame({
+            'Open': close - 1, 'High': close + 1, 'Low': close - 2, 'Close': close,
+            'Volume': volume, 'Dividends': 0.0, 'Stock Splits': 0.0,
+        })
+
+class FakeConnection:
+    """Records every executemany batch and commit instead of talking to MySQL"""
+
+    def __init__(self):
+        self.batches = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rows(self):
+        return [row for _, rows in self.batches for row in rows]
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def executemany(self, query, rows):
+        self.connection.batches.append((query, list(rows)))
+
+    def close(self):
+        pass
+
+def collect(provider, **kwargs):
+    connection = FakeConnection()
+    collector = StockDataCollector(provider=provider, connection=connection, retry_delay=0)
+    collector.collect_historical_data(start_date='2024-01-01', end_date='2024-02-01',
+                                      requests_per_second=0, **kwargs)
+    return connection
+
+def test_every_ticker_is_inserted_in_batches():
+    provider = FakeYFinance(days=5)
+    connection = collect(provider, batch_size=2)
+
+    rows = connection.rows()
+    assert len(rows) == 6 * 5
+    assert {row[0] for row in rows} == {'TCS', 'HDFCBANK', 'BAJFINANCE', 'ASIANPAINT', 'LEMONTREE', 'VBL'}
+    # 5 rows per ticker in batches of 2 -> 3 executemany calls and commits each
+    assert [len(rows) for _, rows in connection.batches].count(2) == 6 * 2
+    assert len(connection.batches) == connection.commits == 6 * 3
+    assert all(calls == 1 for calls in provider.calls.values())
+
+def test_failed_download_is_retried():
+    provider = FakeYFinance(failures={'TCS.NS': 2})
+    connection = collect(provider)
+
+    assert provider.calls['TCS.NS'] == 3
+    assert sum(row[0] == 'TCS' for row in connection.rows()) == 5
+
+def test_ticker_is_skipped_after_retries_run_out(capsys):
+    provider = FakeYFinance(failures={'VBL.NS': 10}, missing={'LEMONTREE.NS'})
+    connection = collect(provider)
+
+    assert provider.calls['VBL.NS'] == 3  # first attempt + DOWNLOAD_RETRIES
+    tickers = {row[0] for row in connection.rows()}
+    assert tickers == {'TCS', 'HDFCBANK', 'BAJFINANCE', 'ASIANPAINT'}
+    out = capsys.readouterr().out
+    assert '❌ Error downloading VBL.NS' in out
+    assert '❌ No data found for LEMONTREE.NS' in out
+
+def test_missing_volume_is_stored_as_null():
+    provider = FakeYFinance(no_volume={'HDFCBANK.NS'})
+    connection = collect(provider)
+
+    hdfc = [row for row in connection.rows() if row[0] == 'HDFCBANK']
+    assert len(hdfc) == 5
+    assert [row[-1] for row in hdfc] == [None, 1000, 1000, 1000, 1000]
+    assert all(type(row[-1]) is int for row in connection.rows() if row[-1] is not None)
@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+
+import feature_store
+from feature_store import read_manifest, read_table, upsert_table, write_table
+
+def prices(tickers, start, days, close=100.0):
+    dates = pd.date_range(start, periods=days)
+    return pd.DataFrame({
+        'ticker': [t for t in tickers for _ in dates],
+        'date': list(dates) * len(tickers),
+        'close_price': close,
+    })
+
+def partition_dirs(store_dir, name='prices'):
+    return sorted(d for d in os.listdir(os.path.join(store_dir, name)) if d.startswith('part-'))
+
+def test_upsert_replaces_rows_without_compacting_small_changes(tmp_path):
+    store = str(tmp_path)
+    write_table(prices(['TCS', 'VBL'], '2024-01-01', 10), 'prices', store)
+    upsert_table(prices(['TCS'], '2024-01-10', 2, close=200.0), 'prices', store_dir=store)
+
+    manifest = read_manifest('prices', store)
+    assert len(manifest['partitions']) == 2
+    assert manifest['partitions'][0]['dropped'] == [9]
+
+    df = read_table('prices', store_dir=store)
+    assert len(df) == 21
+    tcs = df[df['ticker'] == 'TCS'].set_index('date')['close_price']
+    assert tcs[pd.Timestamp('2024-01-10')] == 200.0
+
+def test_upsert_compacts_after_too_many_partitions(tmp_path, monkeypatch):
+    monkeypatch.setattr(feature_store, 'COMPACT_MAX_PARTITIONS', 3)
+    store = str(tmp_path)
+    write_table(prices(['TCS'], '2024-01-01', 30), 'prices', store, metadata={'high_water': {'TCS': '2024-01-30'}})
+    for day in pd.date_range('2024-01-31', periods=3):
+        upsert_table(prices(['TCS'], day, 1), 'prices', store_dir=store)
+
+    manifest = read_manifest('prices', store)
+    assert len(manifest['partitions']) == 1
+    assert partition_dirs(store) == [manifest['partitions'][0]['name']]
+    assert manifest['metadata'] == {'high_water': {'TCS': '2024-01-30'}}
+    assert len(read_table('prices', store_dir=store)) == 33
+
+def test_upsert_compacts_when_most_rows_are_dropped(tmp_path):
+    store = str(tmp_path)
+    write_table(prices(['TCS', 'VBL'], '2024-01-01', 10), 'prices', store)
+    upsert_table(prices(['TCS'], '2024-01-01', 10, close=150.0), 'prices', store_dir=store)
+
+    manifest = read_manifest('prices', store)
+    assert len(manifest['partitions']) == 1
+    assert 'dropped' not in manifest['partitions'][0]
+
+    df = read_table('prices', store_dir=store).sort_values(['ticker', 'date'])
+    assert len(df) == 20
+    assert (df.loc[df['ticker'] == 'TCS', 'close_price'] == 150.0).all()
+    assert (df.loc[df['ticker'] == 'VBL', 'close_price'] == 100.0).all()
+
+def test_read_retries_when_a_rewrite_removes_its_partitions(tmp_path, monkeypatch):
+    store = str(tmp_path)
+    write_table(prices(['TCS'], '2024-01-01', 5), 'prices', store)
+    stale = read_manifest('prices', store)
+    write_table(prices(['TCS', 'VBL'], '2024-01-01', 5), 'prices', store)
+
+    # The reader loads the manifest just before the rewrite swaps it
+    manifests = iter([stale])
+    monkeypatch.setattr(feature_store, 'read_manifest',
+                        lambda name, store_dir=None: next(manifests, None) or read_manifest(name, store_dir))
+    assert len(read_table('prices', store_dir=store)) == 10
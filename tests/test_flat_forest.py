@@ -0,0 +1,68 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+import predictor
+from flat_forest import FlatForest, export_forest, file_sha1
+from predictor import StockPredictor
+
+@pytest.fixture(scope='module')
+def fitted():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 9))
+    y = (X[:, 0] + 0.5 * X[:, 3] - X[:, 7] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+    X_test = rng.normal(size=(50, 9))
+    return model, X_test
+
+def assert_matches(forest, model, X):
+    assert np.allclose(forest.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(forest.predict(X), model.predict(X))
+    assert np.allclose(forest.feature_importances_, model.feature_importances_)
+
+def test_matches_sklearn(fitted):
+    model, X = fitted
+    assert_matches(FlatForest.from_model(model), model, X)
+    # The single-row path the /predict endpoint takes
+    assert np.allclose(FlatForest.from_model(model).predict_proba(X[:1]), model.predict_proba(X[:1]))
+
+def test_memory_mapped_export_matches_sklearn(fitted, tmp_path):
+    model, X = fitted
+    path = tmp_path / 'rf_forest.joblib'
+    joblib.dump(export_forest(model, model_sha1='abc'), path, compress=0)
+
+    forest = FlatForest.load(path)
+    assert isinstance(forest.proba, np.memmap)
+    assert forest.model_sha1 == 'abc'
+    assert_matches(forest, model, X)
+
+def test_stale_export_falls_back_to_the_model(fitted, tmp_path, monkeypatch):
+    model, X = fitted
+    model_path, forest_path = tmp_path / 'rf_model.pkl', tmp_path / 'rf_forest.joblib'
+    joblib.dump(model, model_path)
+    # An export of a different model, as left behind by an earlier training run
+    other = RandomForestClassifier(n_estimators=3, random_state=1).fit(X, (X[:, 1] > 0).astype(int))
+    joblib.dump(export_forest(other, model_sha1='stale'), forest_path, compress=0)
+    monkeypatch.setattr(predictor, 'MODEL_PATH', str(model_path))
+    monkeypatch.setattr(predictor, 'FOREST_PATH', str(forest_path))
+
+    forest = StockPredictor.load_flat_forest(None)
+    assert forest.model_sha1 is None
+    assert_matches(forest, model, X)
+
+    # Once the export matches the model file it is served as is
+    joblib.dump(export_forest(model, model_sha1=file_sha1(model_path)), forest_path, compress=0)
+    forest = StockPredictor.load_flat_forest(None)
+    assert isinstance(forest.proba, np.memmap)
+    assert_matches(forest, model, X)
+
+def test_wrong_feature_count_raises(fitted):
+    model, X = fitted
+    forest = FlatForest.from_model(model)
+    with pytest.raises(ValueError, match='Expected 9 features'):
+        forest.predict_proba(X[:, :8])
+    with pytest.raises(ValueError, match='Expected 9 features'):
+        forest.predict_proba(np.hstack([X, X[:, :1]]))
+    with pytest.raises(ValueError, match='Expected 9 features'):
+        forest.predict_proba(X[0])
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from async_fetcher import AsyncFetcher
+from fixture_server import FixtureServer
+from http_cache import CachedFetcher, HttpCache, _write_atomic
+
+def parse(result):
+    return [result.status, result.text]
+
+def cached_fetcher(fetcher, tmp_path):
+    # ttl=0: every stored page is stale and revalidated on the next fetch
+    return CachedFetcher(fetcher, HttpCache(str(tmp_path / 'http_cache'), ttl=0))
+
+def test_failed_revalidation_serves_the_cached_copy(tmp_path):
+    async def scenario():
+        async with FixtureServer() as server:
+            url = f"{server.url}/ok"
+            async with AsyncFetcher(requests_per_second=1000, retries=1, backoff=0.01) as fetcher:
+                cached = cached_fetcher(fetcher, tmp_path)
+                first = await cached.fetch_parsed(url, parse, 'v1')
+                server.fail('/ok', 503, 503)
+                second = await cached.fetch_parsed(url, parse, 'v1')
+                third = await cached.fetch_parsed(url, parse, 'v1')
+            return first, second, third, cached, len(server.hits('/ok'))
+
+    first, second, third, cached, hits = asyncio.run(scenario())
+    assert first == second == third == [200, 'ok']
+    assert hits == 4  # first fetch, two failed attempts, then a successful revalidation
+    assert cached.stale == 1
+    assert cached.misses == 2
+
+def test_unreachable_host_serves_the_cached_copy(tmp_path):
+    async def scenario():
+        async with FixtureServer() as server:
+            url = f"{server.url}/ok"
+            async with AsyncFetcher(requests_per_second=1000, retries=0) as fetcher:
+                first = await cached_fetcher(fetcher, tmp_path).fetch_parsed(url, parse, 'v1')
+        # The server is gone; revalidating now raises a connection error
+        async with AsyncFetcher(requests_per_second=1000, retries=0) as fetcher:
+            cached = cached_fetcher(fetcher, tmp_path)
+            second = await cached.fetch_parsed(url, parse, 'v1')
+        return first, second, cached
+
+    first, second, cached = asyncio.run(scenario())
+    assert first == second == [200, 'ok']
+    assert cached.stale == 1
+
+def test_failure_without_a_cached_copy_is_returned(tmp_path):
+    async def scenario():
+        async with FixtureServer() as server:
+            server.fail('/ok', 503)
+            async with AsyncFetcher(requests_per_second=1000, retries=0) as fetcher:
+                cached = cached_fetcher(fetcher, tmp_path)
+                return await cached.fetch(f"{server.url}/ok"), cached
+
+    result, cached = asyncio.run(scenario())
+    assert result.status == 503
+    assert cached.stale == 0
+
+def test_concurrent_writes_of_one_entry_never_mix(tmp_path):
+    path = str(tmp_path / 'entry.body')
+    bodies = [bytes([i]) * 200_000 for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda body: _write_atomic(path, body), bodies))
+
+    with open(path, 'rb') as f:
+        assert f.read() in bodies
+    assert [p.name for p in tmp_path.iterdir()] == ['entry.body']
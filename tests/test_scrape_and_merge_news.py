@@ -0,0 +1,58 @@
+import asyncio
+
+import pandas as pd
+
+from config import STOCK_SYMBOLS
+from fixture_server import FixtureServer
+from scrape_and_merge_news import NewsScraperMerger
+
+async def scrape(server, tmp_path):
+    scraper = NewsScraperMerger(base_urls=server.base_urls(), requests_per_second=1000,
+                                per_host=4, cache_dir=str(tmp_path / 'http_cache'))
+    await scraper.scrape_all_stocks_async()
+    return pd.DataFrame(scraper.new_headlines)
+
+def scrape_once(tmp_path, script=None):
+    async def scenario():
+        async with FixtureServer() as server:
+            if script:
+                script(server)
+            return await scrape(server, tmp_path), server
+
+    return asyncio.run(scenario())
+
+def test_scrapes_every_stock_from_every_source(tmp_path):
+    headlines, server = scrape_once(tmp_path)
+
+    assert set(headlines['Ticker']) == set(STOCK_SYMBOLS)
+    per_ticker = headlines.groupby('Ticker')['Source'].value_counts().unstack()
+    # 3 MoneyControl pages x 3 articles, 2 Economic Times stories, 1 Business Standard story
+    assert (per_ticker['MoneyControl'] == 9).all()
+    assert (per_ticker['Economic Times'] == 2).all()
+    assert (per_ticker['Business Standard'] == 1).all()
+
+    tcs = headlines[(headlines['Ticker'] == 'TCS') & (headlines['Source'] == 'MoneyControl')]
+    assert 'Tata Consultancy Services Q2 net profit rises 9% on steady deal wins' in set(tcs['Title'])
+    assert pd.Timestamp('2025-10-10') in set(tcs['Date'])  # "Oct 10, 2025" fallback format
+
+def test_failed_page_is_retried(tmp_path):
+    path = '/moneycontrol/news/tags/hdfc+bank.html'
+    headlines, server = scrape_once(tmp_path, lambda s: s.fail(path, 503))
+
+    assert len(server.hits(path)) == 2
+    hdfc = headlines[(headlines['Ticker'] == 'HDFCBANK') & (headlines['Source'] == 'MoneyControl')]
+    assert len(hdfc) == 9
+
+def test_rescrape_is_served_from_cache(tmp_path):
+    async def scenario():
+        async with FixtureServer() as server:
+            first = await scrape(server, tmp_path)
+            requested = len(server.requests)
+            second = await scrape(server, tmp_path)
+            return first, second, requested, len(server.requests)
+
+    first, second, requested, total = asyncio.run(scenario())
+    # Pages fetched within the cache TTL are not requested again
+    assert requested == 30
+    assert total == requested
+    assert len(second) == len(first)
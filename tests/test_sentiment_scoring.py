@@ -0,0 +1,15 @@
+from sentiment_scoring import score_headlines
+
+class LengthAnalyzer:
+    """Deterministic stand-in for VADER: the compound score is the text length"""
+
+    def polarity_scores(self, text):
+        return {'compound': float(len(text))}
+
+def test_worker_pool_uses_the_given_analyzer():
+    texts = [f"headline {'x' * (i % 7)}" for i in range(25)]
+    scores = score_headlines(texts, workers=2, chunk_size=4, analyzer=LengthAnalyzer())
+    assert scores == [float(len(t)) for t in texts]
+
+def test_single_process_uses_the_given_analyzer():
+    assert score_headlines(['ab', 'abcd'], analyzer=LengthAnalyzer()) == [2.0, 4.0]
@@ -1,5 +1,11 @@
-import pandas as pd
-df = pd.read_csv("data/financial_news.csv", parse_dates=["Date"])
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from news_store import load_news
+
+df = load_news()
 print("Columns:", df.columns.tolist())
 print("Sample rows:\n", df.head(5))
 print("\nHeadlines per ticker:")